@@ -0,0 +1,178 @@
+"""
+Alert dispatch against a local stand-in for the Telegram Bot API: delivery
+rate, retries and drops under latency, rate limiting and server errors.
+
+    python benchmarks/bench_dispatcher.py --messages 200 --latency 0.05
+    python benchmarks/bench_dispatcher.py --rate-limit 0.1 --errors 0.1
+
+The stub answers every /bot<token>/<method> POST with {"ok": true} after
+`--latency` seconds; a `--rate-limit` fraction of calls gets a 429 with
+parameters.retry_after, an `--errors` fraction a 500. Point the live
+system at it with TELEGRAM_API_URL=http://127.0.0.1:<port>. The tests in
+tests/test_dispatcher.py reuse it with scripted replies.
+
+Modes:
+    thread     - one short-lived thread and connection per message (the
+                 previous TelegramService behaviour)
+    dispatcher - the pooled, queued Dispatcher
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.services.dispatcher import Dispatcher
+
+
+class StubAPI(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency=0.0, rate_limit=0.0, errors=0.0, retry_after=1, script=()):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.errors = errors
+        self.retry_after = retry_after
+        self.script = list(script)  # Status codes for the first calls, in order
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.requests = []  # (monotonic time, path, form fields) per call
+        self.connections = 0
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def count(self, key):
+        with self.lock:
+            self.calls[key] = self.calls.get(key, 0) + 1
+
+    def next_status(self):
+        """The next scripted status, else a random one at the configured rates."""
+        with self.lock:
+            if self.script:
+                return self.script.pop(0)
+        roll = random.random()
+        if roll < self.rate_limit:
+            return 429
+        if roll < self.rate_limit + self.errors:
+            return 500
+        return 200
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real API
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        fields = parse_qs(body.decode("latin-1")) \
+            if self.headers.get("Content-Type", "").startswith("application/x-www-form-urlencoded") else {}
+        with self.server.lock:
+            self.server.requests.append((time.monotonic(), self.path, fields))
+        time.sleep(self.server.latency)
+
+        status = self.server.next_status()
+        self.server.count(str(status))
+        if status == 429:
+            self._reply(429, {"ok": False, "error_code": 429, "description": "Too Many Requests",
+                              "parameters": {"retry_after": self.server.retry_after}})
+        elif status >= 400:
+            self._reply(status, {"ok": False, "error_code": status, "description": "Error"})
+        else:
+            self._reply(200, {"ok": True, "result": {}})
+
+    def _reply(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def run_threads(base_url, messages, photo):
+    """One thread (and connection) per message, no retries."""
+    sent = [0]
+    lock = threading.Lock()
+
+    def task(i):
+        try:
+            response = requests.post(f"{base_url}/sendPhoto", data={"chat_id": 1, "caption": str(i)},
+                                     files={"photo": ("alert.jpg", photo, "image/jpeg")}, timeout=10)
+            if response.ok:
+                with lock:
+                    sent[0] += 1
+        except requests.RequestException:
+            pass
+
+    threads = [threading.Thread(target=task, args=(i,), daemon=True) for i in range(messages)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {"sent": sent[0], "failed": messages - sent[0], "dropped": 0, "retries": 0}
+
+
+def run_dispatcher(base_url, messages, photo, args):
+    dispatcher = Dispatcher(base_url, workers=args.workers, max_queue=args.queue_size,
+                            max_retries=args.retries, backoff=args.backoff)
+    for i in range(messages):
+        dispatcher.submit("sendPhoto", {"chat_id": 1, "caption": str(i)},
+                          files={"photo": ("alert.jpg", photo, "image/jpeg")})
+    dispatcher.close(timeout=600)
+    return dispatcher.get_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.02, help="Stub response time (s)")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Fraction of 429 replies")
+    parser.add_argument("--errors", type=float, default=0.0, help="Fraction of 500 replies")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--queue-size", type=int, default=1000)
+    parser.add_argument("--retries", type=int, default=4)
+    parser.add_argument("--backoff", type=float, default=0.1)
+    parser.add_argument("--photo-kb", type=int, default=150)
+    args = parser.parse_args()
+
+    photo = os.urandom(args.photo_kb * 1024)
+    print(f"{args.messages} snapshots of {args.photo_kb} KB, stub latency {args.latency * 1000:.0f} ms, "
+          f"{args.rate_limit:.0%} rate-limited, {args.errors:.0%} errors")
+    print(f"{'mode':>10} | {'seconds':>7} | {'sent':>5} | {'failed':>6} | {'dropped':>7} | "
+          f"{'retries':>7} | connections")
+    for mode in ("thread", "dispatcher"):
+        server = StubAPI(args.latency, args.rate_limit, args.errors)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"{server.url}/botTEST"
+
+        start = time.perf_counter()
+        if mode == "thread":
+            stats = run_threads(base_url, args.messages, photo)
+        else:
+            stats = run_dispatcher(base_url, args.messages, photo, args)
+        seconds = time.perf_counter() - start
+        server.shutdown()
+
+        print(f"{mode:>10} | {seconds:>7.2f} | {stats['sent']:>5} | {stats['failed']:>6} | "
+              f"{stats['dropped']:>7} | {stats['retries']:>7} | {server.connections}")
+
+
+if __name__ == "__main__":
+    main()
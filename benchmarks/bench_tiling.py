@@ -0,0 +1,151 @@
+"""
+Tiled inference: throughput versus person recall against the single
+downscaled pass, on recorded high-resolution footage.
+
+    python benchmarks/bench_tiling.py warehouse_4k.mp4 --frames 300
+    python benchmarks/bench_tiling.py frames/ --labels labels/
+
+Modes:
+    single   - the default pass on the frame downscaled to INFERENCE_SIZE
+    grid     - single pass + every tile of the full-resolution grid
+    adaptive - single pass + TilingPolicy (zones and recent motion, at most
+               TILE_MAX_PER_FRAME tiles per frame), as in the live pipeline
+
+Recall is measured against YOLO-format label files (class 0 = person,
+normalised "cls cx cy w h" per line, one .txt per image) when --labels is
+given, otherwise against the exhaustive grid pass as a reference. "Small"
+people are those under 20% of the frame height, which the single pass
+filters out.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.config.settings import Config
+from src.core.camera import fit_to_size
+from src.core.detector import Detector
+from src.core.motion import MotionGate
+from src.core.offline import EventCollector, _iter_job_frames, plan_jobs
+from src.core.tiling import TilePlan, TilingPolicy
+from src.core.tracker import iou_matrix
+from src.core.zones import zones_for
+
+
+def load_frames(path, limit):
+    """(full frame, label path or None) for up to `limit` frames."""
+    frames = []
+    for job in plan_jobs([path], segment_seconds=10 ** 9, images_per_job=10 ** 9):
+        paths = iter(job[2]) if job[0] == "images" else None
+        for frame, _, _ in _iter_job_frames(job):
+            frames.append((frame, next(paths) if paths else None))
+            if len(frames) >= limit:
+                return frames
+    return frames
+
+
+def load_labels(image_path, labels_dir, width, height):
+    name = os.path.splitext(os.path.basename(image_path))[0] + ".txt"
+    path = os.path.join(labels_dir, name)
+    if not os.path.exists(path):
+        return np.empty((0, 4), dtype=np.float32)
+    rows = np.loadtxt(path, ndmin=2)
+    rows = rows[rows[:, 0] == 0, 1:5] * (width, height, width, height)
+    cx, cy, w, h = rows.T
+    return np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+
+
+def matched(truth, found, iou_threshold=0.5):
+    """Mask of the truth boxes matched by a found box (greedy, one-to-one)."""
+    hit = np.zeros(len(truth), dtype=bool)
+    if not len(truth) or not len(found):
+        return hit
+    iou = iou_matrix(truth, found)
+    used = set()
+    for flat in np.argsort(-iou, axis=None):
+        t, f = np.unravel_index(flat, iou.shape)
+        if iou[t, f] < iou_threshold:
+            break
+        if hit[t] or f in used:
+            continue
+        hit[t] = True
+        used.add(f)
+    return hit
+
+
+def run_mode(detector, frames, mode):
+    """Returns (seconds, person boxes in full-resolution coordinates per frame)."""
+    policy = TilingPolicy(Config.TILE_SIZE, Config.TILE_OVERLAP, Config.TILE_MAX_PER_FRAME,
+                          Config.TILE_ZONES, Config.TILE_MOTION)
+    gate = MotionGate(size=Config.MOTION_FRAME_SIZE, min_area=Config.MOTION_MIN_AREA,
+                      hold_frames=Config.MOTION_HOLD_FRAMES)
+    zones = zones_for("cam0")
+    zone_boxes = [np.concatenate([z.polygon.min(axis=0), z.polygon.max(axis=0)]) for z in zones]
+
+    results = []
+    start = time.perf_counter()
+    for frame, _ in frames:
+        image = fit_to_size(frame, Config.INFERENCE_SIZE)
+        scale = frame.shape[1] / image.shape[1]
+        plan = None
+        if mode == "grid":
+            plan = TilePlan(frame, scale, policy.grid(frame.shape[1], frame.shape[0]))
+        elif mode == "adaptive":
+            gate.should_detect(image)
+            plan = policy.plan(frame, scale, zone_boxes, gate.recent_regions())
+        detections = detector.detect_batch([image], [plan])[0]
+        results.append(detections.persons * scale)
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", help="Video file or folder of images")
+    parser.add_argument("--labels", help="Folder of YOLO-format person labels")
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    frames = load_frames(args.path, args.frames)
+    if not frames:
+        sys.exit(f"No frames read from {args.path}")
+    detector = Detector(EventCollector())
+    height, width = frames[0][0].shape[:2]
+    print(f"{len(frames)} frames at {width}x{height}, inference size {Config.INFERENCE_SIZE}, "
+          f"tiles {Config.TILE_SIZE}px / {Config.TILE_OVERLAP:.0%} overlap")
+
+    # Warm-up (model initialisation, buffer allocation)
+    run_mode(detector, frames[:2], "grid")
+
+    runs = {mode: run_mode(detector, frames, mode) for mode in ("single", "grid", "adaptive")}
+
+    if args.labels:
+        truth = [load_labels(path, args.labels, f.shape[1], f.shape[0]) if path else np.empty((0, 4))
+                 for f, path in frames]
+        reference = "labels"
+    else:
+        truth = runs["grid"][1]
+        reference = "grid pass"
+
+    print(f"{'mode':>9} | {'FPS':>6} | {'ms/frame':>8} | {'recall':>6} | {'small':>6} | people")
+    for mode, (seconds, found) in runs.items():
+        hits, small_hits, total, small_total, people = 0, 0, 0, 0, 0
+        for (frame, _), t_boxes, f_boxes in zip(frames, truth, found):
+            hit = matched(t_boxes, f_boxes)
+            small = (t_boxes[:, 3] - t_boxes[:, 1]) < frame.shape[0] * 0.2
+            hits += hit.sum()
+            small_hits += hit[small].sum()
+            total += len(t_boxes)
+            small_total += small.sum()
+            people += len(f_boxes)
+        recall = hits / total if total else float("nan")
+        small_recall = small_hits / small_total if small_total else float("nan")
+        print(f"{mode:>9} | {len(frames) / seconds:>6.1f} | {seconds / len(frames) * 1000:>8.1f} | "
+              f"{recall:>6.1%} | {small_recall:>6.1%} | {people}")
+    print(f"(recall against the {reference})")
+
+
+if __name__ == "__main__":
+    main()
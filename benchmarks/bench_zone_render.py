@@ -0,0 +1,89 @@
+"""
+Zone rendering benchmark: the previous per-frame frame.copy() + fillPoly +
+full-frame addWeighted + polylines + putText versus the cached ZoneOverlay,
+at 720p, 1080p and 4K, with the default zone and with a multi-zone layout.
+"max diff" is the largest per-channel difference between the two outputs
+(anti-aliased text edges may round one level apart).
+
+    python benchmarks/bench_zone_render.py
+"""
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core.overlay import TextCache, ZoneOverlay
+from src.core.zones import ZoneMap, zones_for
+
+RESOLUTIONS = {"720p": (720, 1280), "1080p": (1080, 1920), "4K": (2160, 3840)}
+
+LAYOUTS = {
+    "default": {"default": [
+        {"name": "RESTRICTED AREA", "polygon": [[0.75, 0], [1, 0], [1, 1], [0.75, 1]]},
+    ]},
+    "3 zones": {"default": [
+        {"name": "RESTRICTED AREA", "polygon": [[0.75, 0], [1, 0], [1, 1], [0.75, 1]]},
+        {"name": "Forklift lane", "polygon": [[0, 0.6], [0.5, 0.6], [0.5, 1], [0, 1]]},
+        {"name": "Press area", "polygon": [[0.3, 0.1], [0.6, 0.15], [0.55, 0.45], [0.25, 0.4]],
+         "color": [0, 165, 255]},
+    ]},
+}
+
+
+def draw_zones_baseline(frame, zones):
+    """The original SurveillanceSystem._draw_zone, once per zone."""
+    height, width = frame.shape[:2]
+    for zone in zones:
+        poly = np.round(zone.polygon * (width, height)).astype(np.int32)
+        overlay = frame.copy()
+        cv2.fillPoly(overlay, [poly], zone.color)
+        cv2.addWeighted(overlay, 0.3, frame, 0.7, 0, frame)
+        cv2.polylines(frame, [poly], True, zone.color, 2)
+        x, y = poly.min(axis=0)
+        cv2.putText(frame, zone.name, (int(x) + 10, int(y) + 30),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, zone.color, 1)
+    cv2.putText(frame, "Status: Nominal", (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+
+
+def bench(fn, frame, repeat):
+    canvas = frame.copy()
+    fn(canvas) # Warm-up (builds the caches)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        np.copyto(canvas, frame)
+        fn(canvas)
+    return (time.perf_counter() - start) / repeat * 1000, canvas
+
+
+def main():
+    rng = np.random.default_rng(0)
+    copy_ms = {}
+    print(f"{'layout':>8} {'size':>6} | {'baseline ms':>11} | {'cached ms':>9} | {'speedup':>7} | max diff")
+    for layout, definitions in LAYOUTS.items():
+        zones = zones_for("cam0", definitions)
+        overlay = ZoneOverlay(ZoneMap(zones))
+        text = TextCache()
+
+        def draw_cached(frame):
+            overlay.draw(frame)
+            text.draw(frame, "Status: Nominal", (20, 40), 1, (0, 255, 0), 2)
+
+        for name, shape in RESOLUTIONS.items():
+            frame = rng.integers(0, 256, shape + (3,), dtype=np.uint8)
+            repeat = 20 if name == "4K" else 100
+            if name not in copy_ms:
+                copy_ms[name], _ = bench(lambda f: None, frame, repeat)
+            t_base, out_base = bench(lambda f: draw_zones_baseline(f, zones), frame, repeat)
+            t_cached, out_cached = bench(draw_cached, frame, repeat)
+            # The per-iteration frame reset is common to both; report drawing only
+            t_base -= copy_ms[name]
+            t_cached -= copy_ms[name]
+            print(f"{layout:>8} {name:>6} | {t_base:>11.2f} | {t_cached:>9.2f} | "
+                  f"{t_base / max(t_cached, 1e-6):>6.1f}x | {np.abs(out_base.astype(int) - out_cached).max()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,58 +1,149 @@
-
-import cv2
+import threading
 import time
 import sys
-from src.core.camera import ThreadedCamera
-from src.core.surveillance import SurveillanceSystem
+from src.core.display import Display
+from src.core.manager import CameraManager
 from src.config.settings import Config
+from src.utils.metrics import RollingStat, RateMeter
 
-def main():
-    print("Starting Industrial Monitoring System...")
-    print("Initializing components...")
+def print_stats(manager, pipeline_latency, throughput, display=None):
+    stats = manager.get_stats()
+    det = stats["detector"]
+    print(f"[STATS] Processing: {throughput.rate:.1f} FPS | "
+          f"Batch: {stats['batch_size']:.1f} frames | "
+          f"Inference: {stats['inference_ms']:.1f} ms (preprocess {det['preprocess_ms']:.1f}, "
+          f"person {det['person_ms']:.1f}, "
+          f"ppe {det['ppe_ms']:.1f}, extract {det['extract_ms']:.1f}, tiles {det['tile_ms']:.1f}) | "
+          f"Analysis: {stats['analysis_ms']:.1f} ms | "
+          f"Capture->processed: {pipeline_latency.mean:.1f} ms")
+    point = stats["operating_point"]
+    if point is not None:
+        print(f"[STATS] Operating point: input {point['input_size']}px, detect every "
+              f"{point['detect_interval']} frame(s) | Inference {point['latency_ms']:.1f} ms/round "
+              f"(budget {point['target_ms']:.1f} ms, {point['changes']} change(s))")
+    alerts = stats["alerts"]
+    if alerts:
+        print(f"[STATS] Alerts: {alerts['sent']} sent, {alerts['failed']} failed, "
+              f"{alerts['dropped']} dropped, {alerts['retries']} retries "
+              f"({alerts['pending']} pending) | Snapshots: {alerts['snapshot']['payload_kb']:.0f} KB "
+              f"at quality {alerts['snapshot']['quality']}, encode {alerts['snapshot']['encode_ms']:.1f} ms")
+    incidents = stats["incidents"]
+    if incidents and incidents["reported"]:
+        print(f"[STATS] Incidents: {incidents['incidents_sent']} sent in {incidents['messages']} "
+              f"message(s) | {incidents['deduplicated']} deduplicated, "
+              f"{incidents['suppressed']} in cooldown")
+    if display is not None:
+        shown = display.get_stats()
+        print(f"[STATS] Display: {shown['display_fps']:.1f} FPS "
+              f"({shown['frames_shown']} shown, {shown['frames_dropped']} dropped)")
+    for cam_id, cam in stats["cameras"].items():
+        print(f"[STATS] {cam_id}: Frame age at consume: {cam['frame_age_ms']:.1f} ms "
+              f"(max {cam['frame_age_max_ms']:.1f}) | "
+              f"Grabbed/Decoded/Delivered: {cam['frames_grabbed']}/"
+              f"{cam['frames_decoded']}/{cam['frames_delivered']} "
+              f"(dropped {cam['frames_dropped']})"
+              + (f" | Motion-gated: {cam['motion']['frames_skipped']} skipped "
+                 f"({cam['motion']['skip_ratio']:.0%})" if "motion" in cam else "")
+              + (f" | Tracked-only: {cam['tracking']['frames_tracked']} frames, "
+                 f"{cam['tracking']['tracks']} tracks" if "tracking" in cam else "")
+              + (f" | Tiled: {cam['tiling']['frames_tiled']} frames, "
+                 f"{cam['tiling']['tiles_per_frame']:.1f} tiles/frame" if "tiling" in cam else "")
+              + (f" | Scene cache: {cam['scene_cache']['hit_rate']:.0%} hits, "
+                 f"{cam['scene_cache']['inferences_saved']} inferences saved" if "scene_cache" in cam else "")
+              + (f" | Clips: {cam['recording']['clips_written']} written, "
+                 f"buffer {cam['recording']['memory_kb']:.0f} KB, "
+                 f"writer queue {cam['recording']['writer_queue']}" if "recording" in cam else ""))
 
-    # Initialize Camera
-    camera = ThreadedCamera(Config.CAMERA_SOURCE)
-    if not camera.start():
-        print("Error: Could not access camera.")
-        sys.exit(1)
+def run_pipeline(manager, display=None):
+    """Processing loop: runs until the stream ends, an error occurs or the display is closed."""
+    # Capture -> processed latency (glass-to-alert minus network)
+    pipeline_latency = RollingStat()
+    throughput = RateMeter()
+    processed = 0
 
-    # Initialize System
-    try:
-        system = SurveillanceSystem()
-    except Exception as e:
-        print(f"Critical Error during initialization: {e}")
-        camera.stop()
-        sys.exit(1)
-
-    print("System Active. Press 'Q' or 'ESC' to exit.")
-
-    while True:
+    while display is None or not display.closed.is_set():
         try:
-            frame = camera.get_frame()
-            if frame is None:
+            # Sleeps until a capture thread signals a frame we have not seen
+            batch = manager.next_batch(timeout=Config.FRAME_WAIT_TIMEOUT)
+            if not batch and not manager.stopped:
                 continue
 
-            # Process
-            processed_frame = system.process_frame(frame)
+            # Process (one batched inference for all cameras; when pipelined
+            # these are the results of the previous batch)
+            results = manager.process_batch(batch) if batch else manager.flush()
+
+            for cam_id, packet, result in results:
+                pipeline_latency.add((time.monotonic() - packet.timestamp) * 1000)
+                throughput.tick()
+                processed += 1
 
-            # Display
-            cv2.imshow("Industrial Monitor", processed_frame)
+                if processed % Config.STATS_INTERVAL == 0:
+                    print_stats(manager, pipeline_latency, throughput, display)
 
-            # Input Handling
-            key = cv2.waitKey(1) & 0xFF
-            if key == ord('q') or key == 27: # ESC
+                # Display (the only consumer of annotated frames besides alerts);
+                # frames between two refreshes are never rendered
+                if display is not None and display.due(cam_id):
+                    display.submit(cam_id, manager.render(cam_id, result))
+
+            if not batch:
+                print("Video stream ended.")
                 break
-                
+
         except KeyboardInterrupt:
             break
         except Exception as e:
             print(f"Runtime Error: {e}")
             break
 
+    if display is not None:
+        display.stop()
+
+def main():
+    print("Starting Industrial Monitoring System...")
+    print("Initializing components...")
+
+    # Initialize Cameras
+    manager = CameraManager(Config.CAMERA_SOURCES, pacing=Config.CAMERA_PACING,
+                            target_fps=Config.CAMERA_TARGET_FPS,
+                            infer_size=Config.INFERENCE_SIZE,
+                            pipelined=Config.PIPELINE_INFERENCE)
+
+    # Initialize System (shared models, per-camera analysis)
+    try:
+        if not manager.start():
+            print("Error: Could not access camera.")
+            sys.exit(1)
+    except Exception as e:
+        print(f"Critical Error during initialization: {e}")
+        manager.stop()
+        sys.exit(1)
+
+    if Config.HEADLESS:
+        print(f"System Active on {len(manager.cameras)} camera(s), headless. Press Ctrl+C to exit.")
+    else:
+        print(f"System Active on {len(manager.cameras)} camera(s). Press 'Q' or 'ESC' to exit.")
+
+    # Preview windows stay on the main thread (HighGUI requires it on some
+    # platforms, e.g. macOS); processing then runs on a worker thread
+    if Config.HEADLESS:
+        run_pipeline(manager)
+    else:
+        display = Display(refresh_fps=Config.DISPLAY_FPS, max_size=Config.DISPLAY_MAX_SIZE,
+                          single=len(manager.cameras) == 1)
+        worker = threading.Thread(target=run_pipeline, args=(manager, display), name="processing",
+                                  daemon=True)
+        worker.start()
+        try:
+            display.run()
+        except KeyboardInterrupt:
+            pass
+        # Window closed (or Ctrl+C): ask the processing loop to finish
+        display.closed.set()
+        worker.join()
+
     # Cleanup
     print("Shutting down...")
-    camera.stop()
-    cv2.destroyAllWindows()
+    manager.stop()
 
 if __name__ == "__main__":
     main()
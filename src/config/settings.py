@@ -1,21 +1,175 @@
+import json
 import os
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+def _parse_sources(value):
+    """Comma separated camera sources; bare integers are device indices."""
+    sources = []
+    for item in value.split(","):
+        item = item.strip()
+        if item:
+            sources.append(int(item) if item.isdigit() else item)
+    return sources
+
+def _load_zones(path):
+    """
+    Zone definitions from a JSON file: either a list of zones for every
+    camera, or a mapping of camera id ("cam0", ...) to zones with an
+    optional "default" entry. Polygons are normalised [[x, y], ...] points.
+    """
+    if not path:
+        return None
+    with open(path) as f:
+        zones = json.load(f)
+    return {"default": zones} if isinstance(zones, list) else zones
+
 class BaseConfig:
     """Base Configuration"""
     # Secrets (Must be loaded from environment)
     TELEGRAM_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
     TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+    # Bot API endpoint; point at a local stub server for testing
+    TELEGRAM_API_URL = os.getenv("TELEGRAM_API_URL", "https://api.telegram.org")
     
     # Defaults
     CAMERA_SOURCE = 0
+    # Multi-camera: e.g. CAMERA_SOURCES="0,rtsp://10.0.0.5/stream1"
+    CAMERA_SOURCES = _parse_sources(os.getenv("CAMERA_SOURCES", "")) or [CAMERA_SOURCE]
     LOG_FILE = os.path.join("logs", "activity_log.csv")
     MODEL_PERSON = "yolov8n.pt"
     MODEL_PPE = "hardhat.pt"
     MAX_HISTORY = 64
+
+    # Restricted zones, rasterised once per camera resolution. Override with
+    # ZONES_FILE=zones.json (see _load_zones); default is the right 25%.
+    ZONES = _load_zones(os.getenv("ZONES_FILE")) or {
+        "default": [
+            {"name": "RESTRICTED AREA", "polygon": [[0.75, 0], [1, 0], [1, 1], [0.75, 1]]},
+        ],
+    }
+
+    # Capture pacing: "native" (every frame), "fps" (throttle), "latest" (drop stale)
+    # or "drain" (grab everything, decode only consumed frames - best for RTSP)
+    CAMERA_PACING = os.getenv("CAMERA_PACING", "latest")
+    CAMERA_TARGET_FPS = 30
+    # Frames are resized once in the capture thread to the models' input size;
+    # full resolution is kept only for alert evidence (None disables)
+    INFERENCE_SIZE = 640
+    # Concurrency: run the two models side by side, and overlap inference of
+    # the next batch with analysis/rendering of the current one
+    PARALLEL_MODELS = True
+    PIPELINE_INFERENCE = True
+    # Letterbox/normalise each frame once into a tensor shared by both models.
+    # Off by default: with tensor input Ultralytics converts the batch back to
+    # uint8 NumPy once per model in postprocess, and frames are already at
+    # INFERENCE_SIZE, so the saving is unmeasured (enable only after timing it)
+    SHARED_PREPROCESS = False
+    # Run the PPE model only on head crops of detected persons, batched at a
+    # small input size, instead of on the full frame
+    PPE_HEAD_CROPS = False
+    PPE_CROP_SIZE = 128
+    PERSON_MIN_HEIGHT = 0.2 # Drop person boxes under this fraction of the frame height
+    # Tiled inference for high-resolution, wide-angle cameras: besides the
+    # downscaled pass, full-resolution tiles overlapping the zones and recent
+    # motion are detected (at most TILE_MAX_PER_FRAME per frame, round-robin)
+    # and merged with cross-tile NMS, so distant workers are not missed.
+    # Experimental: throughput/recall not measured yet (benchmarks/bench_tiling.py)
+    TILED_INFERENCE = False
+    TILE_SIZE = 640 # Full-resolution pixels, run at native resolution
+    TILE_OVERLAP = 0.2
+    TILE_MAX_PER_FRAME = 4
+    TILE_ZONES = True
+    TILE_MOTION = True
+    TILE_PERSON_MIN_HEIGHT = 0.1 # Fraction of the tile height
+    # Motion gating (MOG2 on a downscaled frame): detectors only run on motion,
+    # for a few frames after it stops, and on periodic keep-alive frames
+    MOTION_GATING = True
+    MOTION_FRAME_SIZE = 160 # Longest side of the motion-analysis frame
+    MOTION_MIN_AREA = 0.001 # Min moving blob, as a fraction of the frame area
+    MOTION_HOLD_FRAMES = 15
+    MOTION_KEEPALIVE_FRAMES = 30
+    MOTION_HISTORY = 500
+    MOTION_VAR_THRESHOLD = 25
+    # Static-scene cache: on frames where the motion gate saw no motion, reuse
+    # the last inferred frame's detections when its grey fingerprint is within
+    # SCENE_CACHE_TOLERANCE grey levels (mean abs. difference, over the frame
+    # and within each zone, person, head and helmet box)
+    SCENE_CACHE = False
+    SCENE_CACHE_FINGERPRINT_SIZE = 128 # Longest side of the fingerprint
+    SCENE_CACHE_TOLERANCE = 3.0
+    SCENE_CACHE_PER_ZONE = True
+    SCENE_CACHE_REFRESH_FRAMES = 30 # Frames the result may serve before re-inferring
+    # Tracking: full detection every DETECT_INTERVAL frames (or sooner when a
+    # track becomes uncertain), Kalman-predicted boxes in between
+    TRACKING = True
+    DETECT_INTERVAL = 3
+    TRACK_IOU_THRESHOLD = 0.3
+    TRACK_MAX_MISSES = 3 # Detection rounds a track survives unmatched
+    TRACK_CONFIDENCE_DECAY = 0.95 # Per predicted frame
+    TRACK_MIN_CONFIDENCE = 0.3 # Below this, detect early
+    # Headless: no window and no annotation; results are still analysed,
+    # logged and alerted on (evidence snapshots are rendered on demand)
+    HEADLESS = os.getenv("HEADLESS", "false").lower() in ("1", "true", "yes")
+    # Preview windows refresh independently of processing; intermediate
+    # frames are dropped (DISPLAY_MAX_SIZE downscales, None = as rendered)
+    DISPLAY_FPS = 15
+    DISPLAY_MAX_SIZE = None
+    # Adaptive resolution: keep inference within the budget of ADAPTIVE_TARGET_FPS
+    # by shrinking the model input size (down to ADAPTIVE_MIN_SIZE), then by
+    # detecting less often (up to ADAPTIVE_MAX_INTERVAL, tracking in between)
+    ADAPTIVE_RESOLUTION = True
+    ADAPTIVE_TARGET_FPS = 15
+    ADAPTIVE_SIZES = (640, 512, 416, 320)
+    ADAPTIVE_MIN_SIZE = 320
+    ADAPTIVE_MAX_INTERVAL = 6
+    ADAPTIVE_HYSTERESIS = 0.15
+    ADAPTIVE_WINDOW = 30 # Scheduling rounds per decision
+    # Alert dispatch: one long-lived queue (oldest dropped when full) served
+    # by a few workers on a keep-alive session, with exponential backoff
+    TELEGRAM_WORKERS = 2
+    TELEGRAM_QUEUE_SIZE = 32
+    TELEGRAM_MAX_RETRIES = 4
+    TELEGRAM_BACKOFF = 1.0 # Seconds before the first retry, doubled each time
+    TELEGRAM_TIMEOUT = 10
+    # Alert timing, in seconds of frame time (independent of FPS): a person
+    # must violate for ALERT_DEBOUNCE before alerting, the alert clears after
+    # ALERT_HOLD without the violation, and the same track and zone re-alerts
+    # at most every ALERT_COOLDOWN
+    ALERT_DEBOUNCE = 2.0
+    ALERT_HOLD = 1.0
+    ALERT_COOLDOWN = 30
+    # Alerts from all cameras are collected for ALERT_WINDOW seconds and sent
+    # as one message; a (camera, type, zone) incident repeats at most every
+    # ALERT_KEY_COOLDOWN seconds
+    ALERT_WINDOW = 3.0
+    ALERT_KEY_COOLDOWN = 15
+    # Event clips: the last CLIP_PRE_SECONDS of analysed frames are kept as
+    # JPEGs in memory; an alert writes them plus CLIP_POST_SECONDS to CLIP_DIR.
+    # Off by default: two threads and a frame copy per camera, and disk writes
+    CLIP_RECORDING = False
+    CLIP_DIR = os.path.join("logs", "clips")
+    CLIP_PRE_SECONDS = 5
+    CLIP_POST_SECONDS = 5
+    CLIP_MAX_SIZE = 640 # Longest side of recorded frames
+    CLIP_QUALITY = 80
+    # Alert snapshots: downscaled to SNAPSHOT_MAX_SIZE (longest side) and
+    # JPEG quality lowered from SNAPSHOT_QUALITY as needed to fit the bytes
+    SNAPSHOT_MAX_SIZE = 1920
+    SNAPSHOT_MAX_BYTES = 300_000
+    SNAPSHOT_QUALITY = 90
+    SNAPSHOT_MIN_QUALITY = 40
+    FRAME_WAIT_TIMEOUT = 1.0 # Seconds a consumer waits for a new frame
+    STATS_INTERVAL = 300 # Frames between performance reports
+
+    # Offline batch processing (process_footage.py)
+    OFFLINE_WORKERS = None # None = one per CPU core
+    OFFLINE_BATCH_SIZE = 8
+    OFFLINE_SEGMENT_SECONDS = 120
+    OFFLINE_IMAGES_PER_JOB = 500
+    OFFLINE_IMAGE_FPS = 1.0 # Frame time given to consecutive images (alert hold/cooldown)
     
     # Safety Check
     @classmethod
@@ -33,6 +187,7 @@ class DevelopmentConfig(BaseConfig):
     # Relaxed thresholds for testing
     CONF_PERSON = 0.4
     CONF_HELMET = 0.5
+    ALERT_DEBOUNCE = 1.0
     ALERT_COOLDOWN = 5 # 5 seconds for easier debugging
 
 class ProductionConfig(BaseConfig):
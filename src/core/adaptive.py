@@ -0,0 +1,94 @@
+class ResolutionController:
+    """
+    Holds inference cost within a budget by moving along a quality ladder.
+
+    observe() is fed the inference time of every scheduling round (0 when
+    every frame was gated out); its average over a window of `window`
+    rounds is compared with `target_ms`, the time a round may take to
+    sustain the target FPS.
+
+        over budget  -> smaller model input size, down to `min_size`;
+                        then detect less often (longer tracker interval),
+                        up to `max_interval`
+        under budget -> undo in reverse order: interval first, then size
+
+    Steps up only happen when the cost predicted for the next operating
+    point (inference scales with the input area) still fits under the
+    budget with a `hysteresis` margin, and each decision is taken on a
+    fresh window measured entirely at the current operating point, so the
+    controller does not oscillate.
+    """
+    def __init__(self, target_ms, sizes=(640, 512, 416, 320), min_size=320, base_interval=1,
+                 max_interval=1, hysteresis=0.15, window=30):
+        self.target_ms = target_ms
+        self.sizes = sorted((s for s in sizes if s >= min_size), reverse=True) or [max(sizes)]
+        self.base_interval = base_interval
+        self.max_interval = max(base_interval, max_interval)
+        self.hysteresis = hysteresis
+        self.window = window
+
+        self.level = 0
+        self.interval = base_interval
+        self.latency = 0.0  # Mean ms per round over the last complete window
+        self.window_total = 0.0
+        self.window_rounds = 0
+        self.changes = 0
+
+    @property
+    def size(self):
+        return self.sizes[self.level]
+
+    def observe(self, latency_ms):
+        """Feeds one round's inference time; returns True when the operating point changed."""
+        self.window_total += latency_ms
+        self.window_rounds += 1
+        if self.window_rounds < self.window:
+            return False
+
+        self.latency = self.window_total / self.window_rounds
+        self.window_total, self.window_rounds = 0.0, 0
+
+        if self.latency > self.target_ms * (1 + self.hysteresis):
+            changed = self._degrade()
+        elif self.latency < self.target_ms * (1 - self.hysteresis):
+            changed = self._upgrade()
+        else:
+            changed = False
+
+        if changed:
+            self.changes += 1
+        return changed
+
+    def _degrade(self):
+        if self.level + 1 < len(self.sizes):
+            self.level += 1
+        elif self.interval < self.max_interval:
+            self.interval += 1
+        else:
+            return False # At the quality floor
+        return True
+
+    def _upgrade(self):
+        ceiling = self.target_ms * (1 - self.hysteresis)
+        if self.interval > self.base_interval:
+            # Detecting more often: cost grows with the detection rate
+            if self.latency * self.interval / (self.interval - 1) >= ceiling:
+                return False
+            self.interval -= 1
+        elif self.level > 0:
+            # Larger input: cost grows with the input area
+            if self.latency * (self.sizes[self.level - 1] / self.size) ** 2 >= ceiling:
+                return False
+            self.level -= 1
+        else:
+            return False
+        return True
+
+    def get_stats(self):
+        return {
+            "input_size": self.size,
+            "detect_interval": self.interval,
+            "latency_ms": self.latency,
+            "target_ms": self.target_ms,
+            "changes": self.changes,
+        }
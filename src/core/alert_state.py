@@ -0,0 +1,43 @@
+class AlertState:
+    """
+    Time-based alert state per violation key, e.g. ("ppe", None, track id)
+    or ("zone", zone name, track id).
+
+    A key becomes active once it has been observed for `debounce` seconds
+    with no gap longer than `hold`, and stays active until it has not been
+    observed for `hold` seconds. Each activation fires once, unless the
+    same key already fired less than `cooldown` seconds earlier.
+
+    All times are frame timestamps (seconds), so alerts come at the same
+    moment whatever the frame rate, frame skipping or detect interval.
+    """
+    def __init__(self, debounce=1.0, hold=1.0, cooldown=30.0):
+        self.debounce = debounce
+        self.hold = hold
+        self.cooldown = cooldown
+
+        self.states = {}  # key -> [first seen, last seen, active]
+        self.last_fired = {}  # key -> time of its last alert
+
+    def update(self, now, keys):
+        """Records the keys observed at `now`; returns the keys that just fired."""
+        fired = []
+        for key in keys:
+            state = self.states.get(key)
+            if state is None or now - state[1] > self.hold:
+                state = self.states[key] = [now, now, False]
+            state[1] = now
+            if not state[2] and now - state[0] >= self.debounce:
+                state[2] = True
+                if now - self.last_fired.get(key, now - self.cooldown) >= self.cooldown:
+                    self.last_fired[key] = now
+                    fired.append(key)
+
+        for key in [k for k, state in self.states.items() if now - state[1] > self.hold]:
+            del self.states[key]
+        for key in [k for k, t in self.last_fired.items() if now - t >= self.cooldown]:
+            del self.last_fired[key]
+        return fired
+
+    def active(self):
+        return [key for key, state in self.states.items() if state[2]]
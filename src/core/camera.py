@@ -1,54 +1,316 @@
 import cv2
 import threading
 import time
+from collections import deque, namedtuple
+
+from src.utils.metrics import RollingStat
+
+# A delivered frame: read-only inference-sized view, capture metadata, and the
+# read-only full-resolution original with its scale relative to `image`
+FramePacket = namedtuple("FramePacket", ["image", "seq", "timestamp", "full", "scale"],
+                         defaults=(None, 1.0))
+
+
+def _readonly_view(array):
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+def fit_to_size(frame, longest, dst=None):
+    """
+    Downscales frame so its longest side is `longest` pixels, writing into
+    dst when it already has the right shape. Frames that are already small
+    enough (or longest=None) are returned unchanged.
+    """
+    height, width = frame.shape[:2]
+    if not longest or max(height, width) <= longest:
+        return frame
+
+    ratio = longest / max(height, width)
+    size = (round(width * ratio), round(height * ratio))
+    if dst is None or dst is frame or dst.shape[1::-1] != size:
+        dst = None
+    return cv2.resize(frame, size, dst=dst, interpolation=cv2.INTER_AREA)
+
+
+class FrameSlot:
+    """
+    A preallocated frame buffer tagged with its sequence number and capture time.
+    Holds the full-resolution decode and the inference-sized copy made from it.
+    """
+    __slots__ = ("buffer", "view", "small", "small_view", "seq", "timestamp")
+
+    def __init__(self):
+        self.buffer = None
+        self.view = None
+        self.small = None
+        self.small_view = None
+        self.seq = 0
+        self.timestamp = 0.0
+
+    @property
+    def scale(self):
+        """Full-resolution pixels per inference pixel."""
+        return self.buffer.shape[1] / self.small.shape[1]
+
+
+class FrameRing:
+    """
+    Fixed ring of reusable frame buffers shared by one writer and one reader.
+
+    The writer never touches the newest slot or the last `held` slots handed
+    to the reader, so a view stays valid until the reader has checked out
+    `held` more frames (with the default of one: until the next read). A
+    pipelined reader that keeps frame N alive while fetching N+1 uses
+    held=2. No per-frame allocation takes place once the buffers have been
+    sized by the first read.
+    """
+    def __init__(self, size=3, held=1):
+        if size < held + 2:
+            raise ValueError(f"FrameRing needs at least {held + 2} slots to hold {held} frame(s)")
+        self.slots = [FrameSlot() for _ in range(size)]
+        self.cond = threading.Condition()
+        self.seq = 0
+        self.consumed = 0
+        self.waiting = 0
+        self.latest = -1
+        self.reading = deque(maxlen=held)
+        self.closed = False
+
+    def acquire(self):
+        """Returns the index of a slot that is safe to overwrite."""
+        with self.cond:
+            for i in range(len(self.slots)):
+                if i != self.latest and i not in self.reading:
+                    return i
+
+    def commit(self, index, buffer, small, timestamp):
+        """Publishes a freshly written slot and wakes waiting readers."""
+        with self.cond:
+            self.seq += 1
+            slot = self.slots[index]
+            # Buffers (re)allocated: refresh the cached read-only views
+            if buffer is not slot.buffer:
+                slot.buffer = buffer
+                slot.view = _readonly_view(buffer)
+            if small is not slot.small:
+                slot.small = small
+                slot.small_view = slot.view if small is buffer else _readonly_view(small)
+            slot.seq = self.seq
+            slot.timestamp = timestamp
+            self.latest = index
+            self.cond.notify_all()
+
+    def read(self, last_seq, timeout=None):
+        """
+        Waits until a frame newer than last_seq exists, then checks it out.
+        Returns None on timeout or when the ring is closed and drained.
+        """
+        with self.cond:
+            self.waiting += 1
+            try:
+                self.cond.wait_for(lambda: self.seq > last_seq or self.closed, timeout)
+            finally:
+                self.waiting -= 1
+            if self.seq <= last_seq:
+                return None
+            self.reading.append(self.latest)
+            self.consumed = self.seq
+            self.cond.notify_all()
+            return self.slots[self.latest]
+
+    def wait_consumed(self, timeout=None):
+        """Blocks the writer until the reader has taken the newest frame."""
+        with self.cond:
+            return self.cond.wait_for(lambda: self.consumed >= self.seq or self.closed, timeout)
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
 
 class ThreadedCamera:
     """
     Optimized camera reader that captures frames in a separate thread
     to prevent I/O blocking in the main processing loop.
+
+    Frames are decoded straight into a preallocated ring and handed out as
+    read-only views, each frame exactly once. Consumers are woken by the
+    ring's condition variable as soon as a frame lands.
+
+    With `infer_size` set, the capture thread also resizes each frame once to
+    the model's input size. Packets carry that inference frame as `image` and
+    the untouched full-resolution decode as `full`, which is only copied by
+    whoever needs evidence (alert snapshots, recordings).
+
+    Pacing policies:
+        "native" - deliver every frame at the source's own rate; the capture
+                   thread waits for the consumer instead of dropping frames.
+        "fps"    - throttle capture to target_fps (deadline based, no fixed sleep).
+        "latest" - capture as fast as possible and always hand out the
+                   newest frame, dropping any the consumer did not take.
+        "drain"  - low-latency mode for RTSP/IP cameras: grab() every packet
+                   so nothing queues up inside FFmpeg, but only retrieve()
+                   (colour conversion + copy out of the decoder) the frame
+                   the consumer is actually ready to take.
     """
-    def __init__(self, source=0):
+    PACING_MODES = ("native", "fps", "latest", "drain")
+
+    def __init__(self, source=0, ring_size=3, pacing="latest", target_fps=30, frame_event=None,
+                 infer_size=None, held_frames=1):
+        if pacing not in self.PACING_MODES:
+            raise ValueError(f"Unknown pacing mode: {pacing}")
+
         self.capture = cv2.VideoCapture(source)
         self.capture.set(cv2.CAP_PROP_BUFFERSIZE, 2)
-        
+
         self.force_stop = False
-        self.frame = None
-        self.lock = threading.Lock()
-        
-        # Performance monitoring
-        self.fps_limit = 1/30
+        self.ring = FrameRing(max(ring_size, held_frames + 2), held_frames)
+        self.last_seq = 0
+        self.pacing = pacing
+        self.target_fps = target_fps
+        # Longest side of the inference frame (the model's imgsz); None keeps native size
+        self.infer_size = infer_size
         self.thread = None
 
+        # Optional event shared by several cameras, set whenever a frame lands
+        self.frame_event = frame_event
+        # Drain mode: a poll-style consumer (see request()) wants the next frame
+        self.wanted = False
+
+        # Performance monitoring
+        self.frame_age = RollingStat()  # capture -> consume, in ms
+        self.frames_grabbed = 0
+        self.frames_decoded = 0
+        self.frames_delivered = 0
+
+    @property
+    def stopped(self):
+        """True once the stream has ended or stop() was called."""
+        return self.ring.closed
+
     def start(self):
         if not self.capture.isOpened():
             return None
-            
+
         # Read the first frame to ensure connection
-        ret, self.frame = self.capture.read()
-        if not ret:
+        if not self._capture_into_ring():
             return None
 
         self.thread = threading.Thread(target=self._update_loop, daemon=True)
         self.thread.start()
         return self
 
+    def _capture_into_ring(self):
+        if not self.capture.grab():
+            return False
+        self.frames_grabbed += 1
+        self._retrieve_into_ring(time.monotonic())
+        return True
+
+    def _retrieve_into_ring(self, timestamp):
+        index = self.ring.acquire()
+        slot = self.ring.slots[index]
+        # Decode into the slot's existing buffer (OpenCV reallocates on size change)
+        ret, frame = self.capture.retrieve(slot.buffer)
+        if not ret:
+            return False
+        small = self._downscale(frame, slot.small)
+        self.ring.commit(index, frame, small, timestamp)
+        self.frames_decoded += 1
+        self.wanted = False
+        if self.frame_event is not None:
+            self.frame_event.set()
+        return True
+
+    def _downscale(self, frame, dst):
+        """The one resize per frame: full resolution -> inference size, into dst."""
+        return fit_to_size(frame, self.infer_size, dst)
+
+    def _drain_loop(self):
+        while not self.force_stop:
+            if not self.capture.grab():
+                break
+            self.frames_grabbed += 1
+
+            # Only pay for retrieve() when a consumer is waiting for (or has
+            # requested) a frame; otherwise it is superseded and dropped undecoded.
+            if self.ring.waiting or self.wanted:
+                self._retrieve_into_ring(time.monotonic())
+        self._close()
+
     def _update_loop(self):
+        if self.pacing == "drain":
+            return self._drain_loop()
+
+        interval = 1.0 / self.target_fps if self.target_fps else 0.0
+        next_due = time.monotonic()
+
         while not self.force_stop:
-            ret, frame = self.capture.read()
-            if ret:
-                with self.lock:
-                    self.frame = frame
-            else:
-                self.force_stop = True
-            
-            time.sleep(self.fps_limit)
-
-    def get_frame(self):
-        with self.lock:
-            return self.frame.copy() if self.frame is not None else None
+            if self.pacing == "native":
+                # Backpressure: hold the next read until the consumer caught up
+                if not self.ring.wait_consumed(timeout=0.5):
+                    continue
+            elif self.pacing == "fps":
+                delay = next_due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                # Re-anchor after stalls instead of bursting to catch up
+                next_due = max(next_due + interval, time.monotonic())
+
+            if not self._capture_into_ring():
+                break
+        self._close()
+
+    def _close(self):
+        self.ring.close()
+        if self.frame_event is not None:
+            self.frame_event.set()
+
+    def read(self, timeout=None):
+        """
+        Returns the newest frame not yet delivered as a FramePacket, waiting
+        up to `timeout` seconds (forever if None) for one to arrive.
+        Returns None on timeout or once the stream has ended; check
+        `stopped` to tell the two apart.
+        The image views are only valid until `held_frames` more frames have been read.
+        """
+        slot = self.ring.read(self.last_seq, timeout)
+        if slot is None:
+            return None
+        self.last_seq = slot.seq
+        self.frames_delivered += 1
+        self.frame_age.add((time.monotonic() - slot.timestamp) * 1000)
+        return FramePacket(slot.small_view, slot.seq, slot.timestamp, slot.view, slot.scale)
+
+    def request(self):
+        """
+        Marks the consumer as ready for a new frame without blocking in read().
+        Used by poll-style consumers (CameraManager) so drain mode knows
+        which grabbed frame is worth decoding.
+        """
+        self.wanted = True
+
+    def get_frame(self, timeout=None):
+        packet = self.read(timeout)
+        return packet.image if packet is not None else None
+
+    def get_stats(self):
+        return {
+            "pacing": self.pacing,
+            "frames_grabbed": self.frames_grabbed,
+            "frames_decoded": self.frames_decoded,
+            "frames_delivered": self.frames_delivered,
+            "frames_dropped": self.frames_grabbed - self.frames_delivered,
+            "frame_age_ms": self.frame_age.mean,
+            "frame_age_max_ms": self.frame_age.max,
+        }
 
     def stop(self):
         self.force_stop = True
+        self._close()
         if self.thread:
             self.thread.join()
         self.capture.release()
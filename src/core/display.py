@@ -0,0 +1,94 @@
+import threading
+import time
+
+import cv2
+
+from src.core.camera import fit_to_size
+from src.utils.metrics import RateMeter
+
+TITLE = "Industrial Monitor"
+
+
+class Display:
+    """
+    Preview windows decoupled from processing, so a slow window system
+    never throttles detection. The processing loop (on a worker thread)
+    asks due() before rendering a frame and submit()s it only then; run()
+    shows the newest frame per camera at `refresh_fps` (optionally
+    downscaled so its longest side is `max_size`) and drops anything that
+    arrives in between.
+
+    run() makes every HighGUI call (imshow, waitKey, destroyAllWindows) and
+    must be called on the main thread: some backends (macOS Cocoa) only
+    support them there. Q or ESC in a window sets `closed`; stop() ends
+    run() from another thread.
+    """
+    def __init__(self, refresh_fps=15, max_size=None, single=True):
+        self.interval = 1.0 / refresh_fps if refresh_fps else 0.0
+        self.max_size = max_size
+        self.single = single
+
+        self.lock = threading.Lock()
+        self.pending = {}  # cam_id -> newest frame not yet shown
+        self.last_submit = {}
+        self.closed = threading.Event()
+        self.stopping = threading.Event()
+
+        # Metrics
+        self.rate = RateMeter()
+        self.frames_shown = 0
+        self.frames_dropped = 0
+
+    def due(self, cam_id, now=None):
+        """Whether a new frame for cam_id would be shown (render only then)."""
+        now = time.monotonic() if now is None else now
+        return now - self.last_submit.get(cam_id, float("-inf")) >= self.interval
+
+    def submit(self, cam_id, frame):
+        with self.lock:
+            if cam_id in self.pending:
+                self.frames_dropped += 1
+            self.pending[cam_id] = frame
+            self.last_submit[cam_id] = time.monotonic()
+
+    def _title(self, cam_id):
+        return TITLE if self.single else f"{TITLE} - {cam_id}"
+
+    def run(self):
+        """Shows frames until a window is closed or stop() is called (main thread only)."""
+        try:
+            self._run()
+            cv2.destroyAllWindows()
+        except Exception as e:
+            # No usable window system: shut the pipeline down like a closed window
+            print(f"Display Error: {e}")
+            self.closed.set()
+
+    def _run(self):
+        while not self.stopping.is_set() and not self.closed.is_set():
+            start = time.monotonic()
+            with self.lock:
+                frames, self.pending = self.pending, {}
+
+            for cam_id, frame in frames.items():
+                cv2.imshow(self._title(cam_id), fit_to_size(frame, self.max_size))
+                self.frames_shown += 1
+            if frames:
+                self.rate.tick()
+
+            # waitKey doubles as the refresh-rate sleep and keeps the windows responsive
+            wait_ms = max(1, int((self.interval - (time.monotonic() - start)) * 1000))
+            key = cv2.waitKey(wait_ms) & 0xFF
+            if key == ord('q') or key == 27: # ESC
+                self.closed.set()
+
+    def get_stats(self):
+        return {
+            "display_fps": self.rate.rate,
+            "frames_shown": self.frames_shown,
+            "frames_dropped": self.frames_dropped,
+        }
+
+    def stop(self):
+        """Ends run() (safe to call from any thread)."""
+        self.stopping.set()
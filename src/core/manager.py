@@ -0,0 +1,227 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config.settings import Config
+from src.core.adaptive import ResolutionController
+from src.core.camera import ThreadedCamera
+from src.core.detector import Detections, Detector
+from src.core.surveillance import SurveillanceSystem
+from src.utils.logger import ActivityLogger
+from src.services.alerts import AlertAggregator
+from src.services.telegram import TelegramService
+from src.utils.metrics import RollingStat
+
+
+class CameraManager:
+    """
+    Owns N cameras and schedules their frames through one shared Detector.
+
+    Each scheduling round collects the newest unseen frame from every camera
+    that has one, runs all of them through the person and PPE models as a
+    single batch, and hands each result back to that camera's own
+    SurveillanceSystem (zones, counters and alert state stay per camera).
+
+    When pipelined, inference for batch N+1 runs on a dedicated thread while
+    the caller analyses and renders batch N. Batches are still inferred and
+    analysed strictly in order; results simply come back one round later.
+    """
+    def __init__(self, sources, pacing="latest", target_fps=30, infer_size=None, pipelined=False):
+        self.logger = ActivityLogger(Config.LOG_FILE)
+        self.frame_event = threading.Event()
+        self.pipelined = pipelined
+
+        # A pipelined consumer keeps frame N alive while reading N+1
+        held_frames = 2 if pipelined else 1
+        self.cameras = {}
+        for i, source in enumerate(sources):
+            cam_id = f"cam{i}"
+            self.cameras[cam_id] = ThreadedCamera(source, pacing=pacing, target_fps=target_fps,
+                                                  frame_event=self.frame_event,
+                                                  infer_size=infer_size,
+                                                  held_frames=held_frames)
+
+        self.detector = None
+        self.telegram = None
+        self.alerter = None
+        self.systems = {}
+        self.infer_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference") if pipelined else None
+        self.pending = None  # (batch, detections future) awaiting analysis
+
+        # Holds inference within the frame budget by trading input size and detect rate
+        self.controller = None
+        if Config.ADAPTIVE_RESOLUTION:
+            base_interval = Config.DETECT_INTERVAL if Config.TRACKING else 1
+            self.controller = ResolutionController(
+                1000.0 / Config.ADAPTIVE_TARGET_FPS, sizes=Config.ADAPTIVE_SIZES,
+                min_size=Config.ADAPTIVE_MIN_SIZE, base_interval=base_interval,
+                max_interval=Config.ADAPTIVE_MAX_INTERVAL if Config.TRACKING else 1,
+                hysteresis=Config.ADAPTIVE_HYSTERESIS, window=Config.ADAPTIVE_WINDOW)
+
+        # Performance monitoring, per batch in ms
+        self.batch_size = RollingStat()
+        self.inference_latency = RollingStat()
+        self.analysis_latency = RollingStat()
+
+    def start(self):
+        """Starts every camera; those that fail to open are dropped."""
+        for cam_id, camera in list(self.cameras.items()):
+            if not camera.start():
+                self.logger.error(f"Could not access camera {cam_id}")
+                del self.cameras[cam_id]
+
+        if not self.cameras:
+            return False
+
+        # Shared models and services, per-camera analysis state
+        self.detector = Detector(self.logger)
+        self.telegram = TelegramService(Config.TELEGRAM_TOKEN, Config.TELEGRAM_CHAT_ID)
+        self.alerter = AlertAggregator(self.telegram, window=Config.ALERT_WINDOW,
+                                       cooldown=Config.ALERT_KEY_COOLDOWN)
+        single = len(self.cameras) == 1
+        for cam_id in self.cameras:
+            self.systems[cam_id] = SurveillanceSystem(
+                camera_id=cam_id, detector=self.detector, logger=self.logger,
+                alerter=self.alerter, label=None if single else cam_id)
+        return True
+
+    @property
+    def stopped(self):
+        return all(camera.stopped for camera in self.cameras.values())
+
+    def next_batch(self, timeout=None):
+        """
+        Waits until at least one camera has a new frame, then collects the
+        newest unseen frame from every camera. Returns a list of
+        (camera_id, FramePacket); empty on timeout or when all streams ended.
+        """
+        for camera in self.cameras.values():
+            camera.request()
+
+        batch = self._poll()
+        if batch or not self.frame_event.wait(timeout):
+            return batch
+        return self._poll()
+
+    def _poll(self):
+        # Clear before polling so frames landing mid-poll re-arm the event
+        self.frame_event.clear()
+        batch = []
+        for cam_id, camera in self.cameras.items():
+            packet = camera.read(timeout=0)
+            if packet is not None:
+                batch.append((cam_id, packet))
+        return batch
+
+    def process_batch(self, batch):
+        """
+        Batched inference, then per-camera analysis. Returns a list of
+        (camera_id, packet, AnalysisResult). When pipelined, the results belong to
+        the previously submitted batch (empty on the first call).
+        """
+        # Gate decisions (and tile plans) are taken here, in frame order, on the caller's thread
+        batch = [(cam_id, packet, self._plan(cam_id, packet)) for cam_id, packet in batch]
+        if not self.pipelined:
+            return self._analyze(batch, self._infer(batch)) if batch else []
+
+        previous = self.pending
+        self.pending = (batch, self.infer_pool.submit(self._infer, batch)) if batch else None
+        if previous is None:
+            return []
+        return self._analyze(previous[0], previous[1].result())
+
+    def flush(self):
+        """Returns results for any batch still in flight in the pipeline."""
+        return self.process_batch([]) if self.pipelined else []
+
+    def _plan(self, cam_id, packet):
+        """
+        False when the frame is not to be detected, its Detections when the
+        scene cache already has them, else its TilePlan (None = untiled).
+        """
+        system = self.systems[cam_id]
+        if not system.should_detect(packet.image):
+            return False
+        cached = system.cached_detections(packet.image)
+        if cached is not None:
+            return cached
+        return system.plan_tiles(packet.full if packet.full is not None else packet.image, packet.scale)
+
+    def _infer(self, batch):
+        """
+        Detections aligned with batch; None where the motion gate skipped
+        the frame, the cached result where the scene cache hit.
+        """
+        cached = [plan if isinstance(plan, Detections) else None for _, _, plan in batch]
+        detect = [plan is not False and hit is None for (_, _, plan), hit in zip(batch, cached)]
+        frames = [packet.image for (_, packet, _), d in zip(batch, detect) if d]
+        full_frames = [packet.full for (_, packet, _), d in zip(batch, detect) if d]
+        if not frames:
+            self._adapt(0.0)
+            return cached
+
+        plans = [plan for (_, _, plan), d in zip(batch, detect) if d]
+        start = time.perf_counter()
+        found = iter(self.detector.detect_batch(frames, plans, full_frames))
+        elapsed = (time.perf_counter() - start) * 1000
+        self.inference_latency.add(elapsed)
+        self.batch_size.add(len(frames))
+        self._adapt(elapsed)
+        return [next(found) if d else hit for d, hit in zip(detect, cached)]
+
+    def _adapt(self, inference_ms):
+        """Feeds the controller; applies a new operating point to the detector and every camera."""
+        if self.controller is None or not self.controller.observe(inference_ms):
+            return
+        # Input size is shared by the batch; the detect interval slows every camera evenly
+        self.detector.set_input_size(self.controller.size)
+        for system in self.systems.values():
+            system.detect_interval = self.controller.interval
+        self.logger.info(f"Operating point: input {self.controller.size}px, "
+                         f"detect every {self.controller.interval} frame(s) "
+                         f"({self.controller.latency:.1f} ms/round, budget {self.controller.target_ms:.1f} ms)")
+
+    def _analyze(self, batch, detections):
+        start = time.perf_counter()
+        results = []
+        for (cam_id, packet, _), dets in zip(batch, detections):
+            result = self.systems[cam_id].analyze(packet.image, dets, packet.full, packet.scale,
+                                                  timestamp=packet.timestamp)
+            results.append((cam_id, packet, result))
+        self.analysis_latency.add((time.perf_counter() - start) * 1000)
+        return results
+
+    def render(self, cam_id, result):
+        """Annotated frame for one analysis result (only needed when displaying)."""
+        return self.systems[cam_id].render(result)
+
+    def get_stats(self):
+        return {
+            "batch_size": self.batch_size.mean,
+            "inference_ms": self.inference_latency.mean,
+            "analysis_ms": self.analysis_latency.mean,
+            "detector": self.detector.get_stats() if self.detector else {},
+            "operating_point": self.controller.get_stats() if self.controller else None,
+            "alerts": self.telegram.get_stats() if self.telegram else {},
+            "incidents": self.alerter.get_stats() if self.alerter else None,
+            "cameras": {cam_id: self._camera_stats(cam_id) for cam_id in self.cameras},
+        }
+
+    def _camera_stats(self, cam_id):
+        stats = self.cameras[cam_id].get_stats()
+        system = self.systems.get(cam_id)
+        if system is not None:
+            stats.update(system.get_stats())
+        return stats
+
+    def stop(self):
+        if self.infer_pool:
+            self.infer_pool.shutdown(wait=True)
+        for camera in self.cameras.values():
+            camera.stop()
+        for system in self.systems.values():
+            system.close()
+        if self.alerter:
+            self.alerter.close()
+        if self.telegram:
+            self.telegram.close()
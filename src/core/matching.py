@@ -0,0 +1,137 @@
+import numpy as np
+
+try:
+    # Compiled solver; scipy comes with ultralytics
+    from scipy.optimize import linear_sum_assignment as _compiled_assignment
+except ImportError:
+    _compiled_assignment = None
+
+
+def linear_sum_assignment(cost):
+    """
+    Minimum-cost assignment for a rectangular cost matrix (Hungarian method
+    with potentials, O(n^2 m), inner loop vectorised over columns).
+    Same contract as scipy.optimize.linear_sum_assignment, which is used
+    instead when scipy is installed.
+    Returns (row_indices, col_indices) sorted by row.
+    """
+    if _compiled_assignment is not None:
+        return _compiled_assignment(cost)
+    cost = np.asarray(cost, dtype=np.float64)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+    if n == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    # 1-indexed potentials; p[j] = row assigned to column j (0 = none)
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=np.int64)
+    way = np.zeros(m + 1, dtype=np.int64)
+
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+            improve = free & (reduced < minv[1:])
+            minv[1:][improve] = reduced[improve]
+            way[1:][improve] = j0
+
+            candidates = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+
+            used_cols = np.flatnonzero(used)
+            u[p[used_cols]] += delta
+            v[used_cols] -= delta
+            minv[1:][free] -= delta
+
+            j0 = j1
+            if p[j0] == 0:
+                break
+
+        # Augment along the alternating path
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    cols = np.flatnonzero(p[1:])
+    rows = p[1:][cols] - 1
+    if transposed:
+        rows, cols = cols, rows
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+def match_helmets(persons, helmets):
+    """
+    Globally optimal helmet-to-person assignment.
+
+    A helmet is eligible for a person when its centre lies inside the
+    person's horizontal extent and between 50 px above the head and a third
+    of the way down the box, and its Manhattan distance to the top-centre
+    of the box is below the person's width. Among eligible pairs the
+    assignment maximises the number of matched people, then minimises the
+    total distance. Returns (N, 2) int array of (person index, helmet index).
+    """
+    persons = np.asarray(persons, dtype=np.int64).reshape(-1, 4)
+    helmets = np.asarray(helmets, dtype=np.int64).reshape(-1, 4)
+    if not len(persons) or not len(helmets):
+        return np.empty((0, 2), dtype=np.int64)
+
+    px1, py1, px2, py2 = (persons[:, k, None] for k in range(4))
+    p_center_x = (px1 + px2) // 2
+    h_center_x = ((helmets[:, 0] + helmets[:, 2]) // 2)[None, :]
+    h_center_y = ((helmets[:, 1] + helmets[:, 3]) // 2)[None, :]
+
+    # Head-region gating as (P, H) masks
+    dist = np.abs(p_center_x - h_center_x) + np.abs(py1 - h_center_y)
+    valid = ((px1 < h_center_x) & (h_center_x < px2)
+             & (py1 - 50 < h_center_y) & (h_center_y < py1 + (py2 - py1) // 3)
+             & (dist < (px2 - px1)))
+    if not valid.any():
+        return np.empty((0, 2), dtype=np.int64)
+
+    # Everyone taking their nearest eligible helmet is optimal unless two
+    # people want the same one; that check is vectorised and usually enough.
+    # Only the people and helmets connected to a clash (through eligible
+    # pairs) go through the assignment solver.
+    has_helmet = valid.any(axis=1)
+    rows = np.flatnonzero(has_helmet)
+    nearest = np.where(valid, dist, np.iinfo(np.int64).max)[rows].argmin(axis=1)
+    wanted = np.bincount(nearest, minlength=valid.shape[1])
+    if wanted.max() == 1:
+        return np.stack([rows, nearest], axis=1)
+
+    clash_cols = wanted > 1
+    while True:
+        clash_rows = valid[:, clash_cols].any(axis=1)
+        grown = valid[clash_rows].any(axis=0)
+        if (grown == clash_cols).all():
+            break
+        clash_cols = grown
+
+    keep = ~clash_rows[rows]
+    matches = [np.stack([rows[keep], nearest[keep]], axis=1)]
+    rows, cols = np.flatnonzero(clash_rows), np.flatnonzero(clash_cols)
+    sub_valid = valid[np.ix_(rows, cols)]
+    sub_dist = dist[np.ix_(rows, cols)]
+    # Infeasible pairs cost more than any full set of feasible ones, so the
+    # solver first maximises the match count, then minimises distance
+    big = (sub_dist[sub_valid].max() + 1.0) * (min(sub_valid.shape) + 1)
+    r, c = linear_sum_assignment(np.where(sub_valid, sub_dist, big))
+    feasible = sub_valid[r, c]
+    matches.append(np.stack([rows[r[feasible]], cols[c[feasible]]], axis=1))
+
+    matches = np.concatenate(matches)
+    return matches[np.argsort(matches[:, 0])]
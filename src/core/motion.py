@@ -0,0 +1,94 @@
+import cv2
+import numpy as np
+
+from src.core.camera import fit_to_size
+
+
+class MotionGate:
+    """
+    Cheap background-subtraction gate in front of the detectors, ported from
+    the MOG2 pipeline in legacy/image_detection.py. It runs on a heavily
+    downscaled frame and decides whether the full detectors need to run:
+
+        - while there is motion,
+        - for `hold_frames` after motion stops (people standing still),
+        - on a keep-alive frame every `keepalive_frames` otherwise.
+    """
+    def __init__(self, size=160, min_area=0.001, hold_frames=15, keepalive_frames=30,
+                 history=500, var_threshold=25):
+        # Using MOG2 (Mixture of Gaussians) for better shadow handling and lighting adaptation
+        self.back_sub = cv2.createBackgroundSubtractorMOG2(history=history, varThreshold=var_threshold,
+                                                           detectShadows=True)
+        self.size = size
+        self.min_area = min_area  # Fraction of the (downscaled) frame area
+        self.hold_frames = hold_frames
+        self.keepalive_frames = keepalive_frames
+
+        self.frames_since_motion = hold_frames + 1
+        self.frames_since_detect = keepalive_frames
+        self.moving = False  # Motion seen in the last frame
+        self.keepalive = False  # Last frame passed only as a keep-alive frame
+        # Moving blobs of the last frame with motion, normalised xyxy
+        self.motion_regions = np.empty((0, 4), dtype=np.float32)
+
+        # Metrics
+        self.frames_total = 0
+        self.frames_motion = 0
+        self.frames_skipped = 0
+
+    def has_motion(self, frame):
+        small = fit_to_size(frame, self.size)
+        fg_mask = self.back_sub.apply(small)
+
+        # Remove shadows (gray pixels) from the mask by simple thresholding
+        _, fg_mask = cv2.threshold(fg_mask, 250, 255, cv2.THRESH_BINARY)
+
+        # Morphological opening to remove noise (one pass; the frame is tiny)
+        fg_mask = cv2.erode(fg_mask, None, iterations=1)
+        fg_mask = cv2.dilate(fg_mask, None, iterations=1)
+
+        height, width = small.shape[:2]
+        min_pixels = self.min_area * height * width
+        contours, _ = cv2.findContours(fg_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        moving = [cv2.boundingRect(c) for c in contours if cv2.contourArea(c) > min_pixels]
+        if moving:
+            rects = np.array(moving, dtype=np.float32)
+            rects[:, 2:] += rects[:, :2]
+            self.motion_regions = rects / (width, height, width, height)
+        return bool(moving)
+
+    def should_detect(self, frame):
+        """Updates the background model with frame and returns whether to run detection."""
+        self.frames_total += 1
+
+        self.moving = self.has_motion(frame)
+        if self.moving:
+            self.frames_motion += 1
+            self.frames_since_motion = 0
+        else:
+            self.frames_since_motion += 1
+
+        holding = self.frames_since_motion <= self.hold_frames
+        self.keepalive = not holding and self.frames_since_detect + 1 >= self.keepalive_frames
+        detect = holding or self.keepalive
+
+        if detect:
+            self.frames_since_detect = 0
+        else:
+            self.frames_since_detect += 1
+            self.frames_skipped += 1
+        return detect
+
+    def recent_regions(self):
+        """Where things moved, while motion is recent (within hold_frames); else empty."""
+        if self.frames_since_motion <= self.hold_frames:
+            return self.motion_regions
+        return self.motion_regions[:0]
+
+    def get_stats(self):
+        return {
+            "frames": self.frames_total,
+            "motion_frames": self.frames_motion,
+            "frames_skipped": self.frames_skipped,
+            "skip_ratio": self.frames_skipped / self.frames_total if self.frames_total else 0.0,
+        }
@@ -0,0 +1,232 @@
+import datetime
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+
+from src.config.settings import Config
+from src.core.camera import fit_to_size
+from src.utils.logger import ActivityLogger
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".m4v", ".mpg", ".ts")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+# Models of this worker process, loaded by its first job and reused by the rest
+_detector = None
+
+
+class EventCollector:
+    """
+    Logger stand-in used inside worker processes. Events are buffered and
+    returned to the parent, which writes them to the activity log in media
+    order instead of having every worker append to the CSV concurrently.
+    """
+    def __init__(self):
+        self.events = []
+        self.console = logging.getLogger("IndustrialMonitor")
+
+    def log_event(self, count, event_type, details="", timestamp=None):
+        self.events.append((timestamp, event_type, details, count))
+
+    def info(self, message):
+        self.console.info(message)
+
+    def warning(self, message):
+        self.console.warning(message)
+
+    def error(self, message):
+        self.console.error(message)
+
+
+def _format_media_time(seconds):
+    ms = int(round(seconds * 1000))
+    return f"{ms // 3600000:02d}:{ms // 60000 % 60:02d}:{ms // 1000 % 60:02d}.{ms % 1000:03d}"
+
+
+def plan_jobs(paths, segment_seconds, images_per_job):
+    """
+    Expands files/directories into work units:
+    ("video", path, start_frame, end_frame, fps) or ("images", label, [paths]).
+    """
+    jobs = []
+    for path in paths:
+        if os.path.isdir(path):
+            names = sorted(os.listdir(path))
+            images = [os.path.join(path, n) for n in names if n.lower().endswith(IMAGE_EXTENSIONS)]
+            for i in range(0, len(images), images_per_job):
+                jobs.append(("images", os.path.basename(os.path.normpath(path)), images[i:i + images_per_job]))
+            videos = [os.path.join(path, n) for n in names if n.lower().endswith(VIDEO_EXTENSIONS)]
+            jobs.extend(plan_jobs(videos, segment_seconds, images_per_job))
+            continue
+
+        capture = cv2.VideoCapture(path)
+        if not capture.isOpened():
+            raise IOError(f"Cannot open {path}")
+        fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+        total = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        capture.release()
+
+        segment = max(1, int(segment_seconds * fps))
+        for start in range(0, max(total, 1), segment):
+            jobs.append(("video", path, start, min(start + segment, total) if total else None, fps))
+    return jobs
+
+
+def _init_worker(threads):
+    # Each worker owns a model copy; keep torch from oversubscribing the cores
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+
+def _get_detector():
+    global _detector
+    if _detector is None:
+        # Imported here so the parent process never loads the models
+        from src.core.detector import Detector
+        _detector = Detector(EventCollector())
+    return _detector
+
+
+def _iter_job_frames(job):
+    """
+    Yields (frame, media_seconds, event_time) for one work unit. Images are
+    timed as a sequence at OFFLINE_IMAGE_FPS (file times may repeat or be
+    far apart); their modification time is only used as the event time.
+    """
+    kind = job[0]
+    if kind == "images":
+        index = 0
+        for path in job[2]:
+            frame = cv2.imread(path)
+            if frame is None:
+                continue
+            mtime = os.path.getmtime(path)
+            yield (frame, index / Config.OFFLINE_IMAGE_FPS,
+                   datetime.datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S"))
+            index += 1
+        return
+
+    _, path, start, end, fps = job
+    capture = cv2.VideoCapture(path)
+    if start:
+        capture.set(cv2.CAP_PROP_POS_FRAMES, start)
+    index = start
+    try:
+        while end is None or index < end:
+            ret, frame = capture.read()
+            if not ret:
+                break
+            seconds = index / fps
+            yield frame, seconds, _format_media_time(seconds)
+            index += 1
+    finally:
+        capture.release()
+
+
+def process_job(job, batch_size, camera_id="cam0"):
+    """
+    Worker entry point: analyses one video segment or image chunk with the
+    zones of `camera_id`. Alert state starts fresh at each segment boundary.
+    """
+    from src.core.detector import Detections
+    from src.core.surveillance import SurveillanceSystem
+
+    start = time.perf_counter()
+    collector = EventCollector()
+    label = os.path.basename(job[1])
+    system = SurveillanceSystem(camera_id=camera_id, detector=_get_detector(),
+                                logger=collector, alerts=False, label=label)
+    if job[0] == "images":
+        # Stills: every image is a complete, unrelated observation. Detect
+        # each one (no motion gate, tracker or scene cache) and do not debounce
+        system.motion_gate = None
+        system.tracker = None
+        system.scene_cache = None
+        system.alert_state.debounce = 0.0
+
+    frames = 0
+    batch = []
+
+    def flush():
+        detected = [item for item in batch if item[1] is not False and not isinstance(item[1], Detections)]
+        found = iter(system.detector.detect_batch([item[0] for item in detected],
+                                                  [item[1] for item in detected],
+                                                  [item[2] for item in detected]))
+        for image, plan, _, seconds, event_time in batch:
+            if isinstance(plan, Detections):
+                detections = plan
+            else:
+                detections = next(found) if plan is not False else None
+            system.analyze(image, detections, event_time=event_time, timestamp=seconds)
+        batch.clear()
+
+    for frame, seconds, event_time in _iter_job_frames(job):
+        image = fit_to_size(frame, Config.INFERENCE_SIZE)
+        # False: gated out; Detections: scene cache hit; else the frame's TilePlan (None = untiled)
+        plan = False
+        if system.should_detect(image):
+            plan = system.cached_detections(image)
+            if plan is None:
+                plan = system.plan_tiles(frame, frame.shape[1] / image.shape[1])
+        # Head crops are cut from the original; otherwise do not hold on to it
+        full = frame if system.detector.head_crops and image is not frame else None
+        batch.append((image, plan, full, seconds, event_time))
+        frames += 1
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    events = [(job[1], event[0]) + event for event in collector.events]
+    return frames, events, time.perf_counter() - start
+
+
+def run_offline(paths, workers=None, batch_size=None, segment_seconds=None, log_file=None,
+                camera_id="cam0"):
+    """
+    Processes recorded footage headlessly as fast as the hardware allows,
+    checking the restricted zones configured for `camera_id`.
+    Returns a summary dict with frame counts and throughput.
+    """
+    workers = workers or Config.OFFLINE_WORKERS or os.cpu_count() or 1
+    batch_size = batch_size or Config.OFFLINE_BATCH_SIZE
+    segment_seconds = segment_seconds or Config.OFFLINE_SEGMENT_SECONDS
+
+    logger = ActivityLogger(log_file or Config.LOG_FILE)
+    jobs = plan_jobs(paths, segment_seconds, Config.OFFLINE_IMAGES_PER_JOB)
+    logger.info(f"Offline run: {len(jobs)} job(s) across {workers} worker(s), batch {batch_size}")
+
+    start = time.perf_counter()
+    total_frames = 0
+    events = []
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(threads,)) as pool:
+        futures = {pool.submit(process_job, job, batch_size, camera_id): job for job in jobs}
+        for future in as_completed(futures):
+            frames, job_events, elapsed = future.result()
+            total_frames += frames
+            events.extend(job_events)
+            logger.info(f"{os.path.basename(futures[future][1])}: {frames} frames "
+                        f"in {elapsed:.1f}s ({frames / elapsed if elapsed else 0:.1f} FPS)")
+
+    # Write events in media order: by source, then by position within it
+    for _, _, timestamp, event_type, details, count in sorted(events, key=lambda e: (e[0], e[1] or "")):
+        logger.log_event(count, event_type, details, timestamp=timestamp)
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        "jobs": len(jobs),
+        "frames": total_frames,
+        "events": len(events),
+        "seconds": elapsed,
+        "fps": total_frames / elapsed if elapsed else 0.0,
+    }
+    logger.info(f"Processed {total_frames} frames in {elapsed:.1f}s "
+                f"({summary['fps']:.1f} FPS), {len(events)} event(s) logged")
+    return summary
@@ -0,0 +1,134 @@
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+ZONE_ALPHA = 0.3
+ZONE_LINE = 2
+
+# Sparse drawing: pixel coordinates plus 0-255 coverage (newer OpenCV
+# anti-aliases putText, so text edges are partially covered). The first
+# `solid` pixels are fully covered and are written without blending.
+Sprite = namedtuple("Sprite", ["ys", "xs", "alpha", "solid"])
+
+# One zone's precomputed drawing at a given resolution. The tint is blended
+# into fill_rect only (fill_mask is None when the polygon fills it); the
+# outline and label are a Sprite in frame coordinates.
+ZoneLayer = namedtuple("ZoneLayer", ["fill_rect", "fill_mask", "tint", "strokes", "color"])
+
+
+def _sprite(draw, shape):
+    """Pixels drawn by `draw(mask)` in colour 255 on a blank mask."""
+    mask = np.zeros(shape, dtype=np.uint8)
+    draw(mask)
+    ys, xs = np.nonzero(mask)
+    alpha = mask[ys, xs]
+    order = np.argsort(alpha < 255, kind="stable")
+    return Sprite(ys[order], xs[order], alpha[order].astype(np.uint16)[:, None],
+                  int(np.count_nonzero(alpha == 255)))
+
+
+def _blit(frame, sprite, color, dy=0, dx=0):
+    """Draws a sprite in a solid colour at an offset, clipped to the frame."""
+    ys, xs = sprite.ys + dy, sprite.xs + dx
+    alpha, solid = sprite.alpha, sprite.solid
+    if dy or dx:
+        height, width = frame.shape[:2]
+        inside = (ys >= 0) & (ys < height) & (xs >= 0) & (xs < width)
+        ys, xs, alpha = ys[inside], xs[inside], alpha[inside]
+        solid = int(np.count_nonzero(inside[:solid]))
+
+    frame[ys[:solid], xs[:solid]] = color
+    # Partially covered edge pixels: blend, rounding like OpenCV
+    ys, xs, alpha = ys[solid:], xs[solid:], alpha[solid:]
+    pixels = frame[ys, xs].astype(np.uint16)
+    frame[ys, xs] = (pixels * (255 - alpha) + np.asarray(color, dtype=np.uint16) * alpha + 127) // 255
+
+
+class ZoneOverlay:
+    """
+    Renders the zones of a ZoneMap without full-frame passes. Per frame
+    resolution each zone's tint, fill mask, outline and label are built
+    once; drawing then blends only each zone's bounding rectangle in place
+    and writes the cached outline/label pixels. The output matches fillPoly
+    on a frame copy + full-frame addWeighted + polylines + putText.
+    """
+    def __init__(self, zone_map):
+        self.zone_map = zone_map
+        self.layers = {}
+
+    def draw(self, frame):
+        for layer in self._layers(frame.shape[:2]):
+            ys, xs = layer.fill_rect
+            roi = frame[ys, xs]
+            if layer.fill_mask is None:
+                cv2.addWeighted(roi, 1 - ZONE_ALPHA, layer.tint, ZONE_ALPHA, 0, dst=roi)
+            else:
+                blended = cv2.addWeighted(roi, 1 - ZONE_ALPHA, layer.tint, ZONE_ALPHA, 0)
+                cv2.copyTo(blended, layer.fill_mask, roi)
+            _blit(frame, layer.strokes, layer.color)
+
+    def _layers(self, shape):
+        key = (shape, self.zone_map.version)
+        layers = self.layers.get(key)
+        if layers is None:
+            # Only the inference and evidence resolutions are ever live
+            self.layers = {k: v for k, v in self.layers.items() if k[1] == self.zone_map.version}
+            layers = self.layers[key] = [self._build(zone, shape) for zone in self.zone_map.zones]
+        return layers
+
+    @staticmethod
+    def _build(zone, shape):
+        height, width = shape
+        poly = np.round(zone.polygon * (width, height)).astype(np.int32)
+
+        # Fill: tight bounding rectangle of the polygon, clipped to the frame
+        x1, y1 = np.clip(poly.min(axis=0), 0, (width, height))
+        x2, y2 = np.clip(poly.max(axis=0) + 1, 0, (width, height))
+        mask = np.zeros((y2 - y1, x2 - x1), dtype=np.uint8)
+        cv2.fillPoly(mask, [poly - (x1, y1)], 255)
+        fill_mask = None if mask.all() else mask
+        tint = np.full(mask.shape + (3,), zone.color, dtype=np.uint8)
+
+        # Outline and label, drawn once onto a blank canvas
+        org = tuple(int(v) for v in poly.min(axis=0) + (10, 30))
+
+        def draw(mask):
+            cv2.polylines(mask, [poly], True, 255, ZONE_LINE)
+            cv2.putText(mask, zone.name, org, FONT, 0.5, 255, 1)
+
+        return ZoneLayer((slice(y1, y2), slice(x1, x2)), fill_mask, tint, _sprite(draw, shape), zone.color)
+
+
+class TextCache:
+    """
+    putText replacement for labels that repeat frame after frame (status
+    lines): each (text, scale, thickness) is rasterised once and then
+    blended into the frame as a handful of pixels in any colour.
+    """
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.sprites = {}
+
+    def draw(self, frame, text, org, scale, color, thickness):
+        key = (text, scale, thickness)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            if len(self.sprites) >= self.max_entries:
+                self.sprites.clear()
+            sprite = self.sprites[key] = self._build(*key)
+
+        _blit(frame, sprite, color, org[1], org[0])
+
+    @staticmethod
+    def _build(text, scale, thickness):
+        (text_w, text_h), baseline = cv2.getTextSize(text, FONT, scale, thickness)
+        pad = thickness + 2
+        origin = (pad, pad + text_h)
+
+        def draw(mask):
+            cv2.putText(mask, text, origin, FONT, scale, 255, thickness)
+
+        sprite = _sprite(draw, (text_h + baseline + 2 * pad, text_w + 2 * pad))
+        return sprite._replace(ys=sprite.ys - origin[1], xs=sprite.xs - origin[0])
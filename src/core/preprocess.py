@@ -0,0 +1,76 @@
+import math
+from collections import namedtuple
+
+import cv2
+import numpy as np
+import torch
+
+# How a frame was placed on the letterboxed canvas
+Letterbox = namedtuple("Letterbox", ["gain", "pad_x", "pad_y", "width", "height"])
+
+
+def unletterbox(xyxy, lb):
+    """Maps (N, 4) boxes from canvas coordinates back to frame coordinates."""
+    boxes = (np.asarray(xyxy, dtype=np.float32).reshape(-1, 4)
+             - (lb.pad_x, lb.pad_y, lb.pad_x, lb.pad_y)) / lb.gain
+    np.clip(boxes[:, 0::2], 0, lb.width, out=boxes[:, 0::2])
+    np.clip(boxes[:, 1::2], 0, lb.height, out=boxes[:, 1::2])
+    return boxes
+
+
+class Preprocessor:
+    """
+    Letterboxes a batch of BGR frames once into a normalised BCHW tensor
+    that both YOLO models consume, instead of each model repeating the
+    resize, colour conversion and normalisation on the raw frame.
+
+    The uint8 canvas and float32 input buffers are reused between calls and
+    only reallocated when the batch size or canvas shape changes. The tensor
+    returned shares memory with the float buffer, so it is only valid until
+    the next call.
+    """
+    PAD_VALUE = 114  # Ultralytics' letterbox grey
+
+    def __init__(self, imgsz=640, stride=32):
+        self.imgsz = imgsz
+        self.stride = stride
+        self.canvas = None
+        self.blob = None
+        self.tensor = None
+
+    def __call__(self, frames):
+        """Returns (tensor, [Letterbox per frame])."""
+        placements = []
+        for frame in frames:
+            h, w = frame.shape[:2]
+            gain = min(self.imgsz / h, self.imgsz / w)
+            placements.append((gain, round(w * gain), round(h * gain)))
+
+        # Smallest stride-aligned canvas that fits every frame in the batch
+        canvas_h = math.ceil(max(p[2] for p in placements) / self.stride) * self.stride
+        canvas_w = math.ceil(max(p[1] for p in placements) / self.stride) * self.stride
+        self._ensure_buffers(len(frames), canvas_h, canvas_w)
+
+        letterboxes = []
+        for i, (frame, (gain, new_w, new_h)) in enumerate(zip(frames, placements)):
+            h, w = frame.shape[:2]
+            pad_x = (canvas_w - new_w) // 2
+            pad_y = (canvas_h - new_h) // 2
+            if (new_w, new_h) != (w, h):
+                frame = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+
+            canvas = self.canvas[i]
+            canvas.fill(self.PAD_VALUE)
+            canvas[pad_y:pad_y + new_h, pad_x:pad_x + new_w] = frame
+            letterboxes.append(Letterbox(gain, pad_x, pad_y, w, h))
+
+        # BGR HWC uint8 -> RGB CHW float32 in [0, 1], in one pass into the reused buffer
+        np.multiply(self.canvas[..., ::-1].transpose(0, 3, 1, 2), np.float32(1 / 255), out=self.blob)
+        return self.tensor, letterboxes
+
+    def _ensure_buffers(self, batch, height, width):
+        if self.canvas is not None and self.canvas.shape[:3] == (batch, height, width):
+            return
+        self.canvas = np.empty((batch, height, width, 3), dtype=np.uint8)
+        self.blob = np.empty((batch, 3, height, width), dtype=np.float32)
+        self.tensor = torch.from_numpy(self.blob)
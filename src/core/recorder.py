@@ -0,0 +1,196 @@
+import datetime
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+import cv2
+
+from src.core.camera import fit_to_size
+from src.utils.metrics import RollingStat
+
+
+class ClipRecorder:
+    """
+    Pre/post-event video clips from an in-memory ring of JPEG frames.
+
+    add() is the only call on the processing loop: it downscales the frame
+    to `max_size` (longest side) into a private copy and queues it without
+    blocking (frames are dropped when the encoder falls behind). An encoder
+    thread compresses frames into a ring covering the last `pre_seconds`,
+    so memory is bounded by the compressed size, not raw BGR.
+
+    trigger() starts a clip: the buffered frames plus the next
+    `post_seconds`. Triggers while a clip is being captured, or within
+    `cooldown` seconds of the previous one, are ignored. Finished clips are
+    decoded and written to `output_dir` by a writer thread; at most
+    `max_pending` clips wait for it, further ones are dropped.
+    """
+    def __init__(self, output_dir, label=None, pre_seconds=5.0, post_seconds=5.0, max_size=640,
+                 quality=80, cooldown=15.0, max_queue=64, max_pending=4):
+        self.output_dir = output_dir
+        self.label = label or "cam"
+        self.pre_seconds = pre_seconds
+        self.post_seconds = post_seconds
+        self.max_size = max_size
+        self.quality = quality
+        self.cooldown = cooldown
+        self.console = logging.getLogger("IndustrialMonitor")
+
+        self.inbox = queue.Queue(max_queue)  # (monotonic time, frame) or None to stop
+        self.clips = queue.Queue(max_pending)  # (wall time, [(monotonic time, jpeg)]) or None
+        self.lock = threading.Lock()
+        self.ring = deque()  # (monotonic time, jpeg), oldest first
+        self.ring_bytes = 0
+        self.clip = None  # [wall time, end time, frames] being captured
+        self.clip_bytes = 0  # Frames of the clip being captured (pre-event part included)
+        self.pending_bytes = 0  # Frames of clips waiting for the writer
+        self.trigger_at = None
+        self.last_trigger = -cooldown
+
+        # Metrics
+        self.encode_ms = RollingStat()
+        self.frames_dropped = 0
+        self.clips_written = 0
+        self.clips_dropped = 0
+        self.triggers_ignored = 0
+
+        self.encoder = threading.Thread(target=self._encode_loop, name=f"clip-encoder-{self.label}", daemon=True)
+        self.writer = threading.Thread(target=self._write_loop, name=f"clip-writer-{self.label}", daemon=True)
+        self.encoder.start()
+        self.writer.start()
+
+    def add(self, frame, timestamp=None):
+        """Queues one frame for the pre-event buffer (never blocks)."""
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        small = fit_to_size(frame, self.max_size)
+        # Camera frames are shared read-only views; the encoder needs its own copy
+        small = small.copy() if small is frame else small
+        try:
+            self.inbox.put_nowait((timestamp, small))
+        except queue.Full:
+            self.frames_dropped += 1
+
+    def trigger(self, timestamp=None):
+        """Requests a clip around `timestamp` (now); returns False when ignored."""
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        with self.lock:
+            if self.clip is not None or self.trigger_at is not None \
+                    or timestamp - self.last_trigger < self.cooldown:
+                self.triggers_ignored += 1
+                return False
+            self.trigger_at = timestamp
+            self.last_trigger = timestamp
+        return True
+
+    def _encode_loop(self):
+        params = [cv2.IMWRITE_JPEG_QUALITY, self.quality]
+        while True:
+            item = self.inbox.get()
+            if item is None:
+                break
+            timestamp, frame = item
+
+            start = time.perf_counter()
+            ok, jpeg = cv2.imencode(".jpg", frame, params)
+            self.encode_ms.add((time.perf_counter() - start) * 1000)
+            if not ok:
+                continue
+
+            with self.lock:
+                self.ring.append((timestamp, jpeg))
+                self.ring_bytes += len(jpeg)
+                while timestamp - self.ring[0][0] > self.pre_seconds:
+                    _, old = self.ring.popleft()
+                    self.ring_bytes -= len(old)
+
+                if self.clip is None and self.trigger_at is not None:
+                    # Pre-event part: everything buffered, this frame included
+                    self.clip = [time.time(), self.trigger_at + self.post_seconds, list(self.ring)]
+                    self.clip_bytes = self.ring_bytes
+                    self.trigger_at = None
+                elif self.clip is not None:
+                    self.clip[2].append((timestamp, jpeg))
+                    self.clip_bytes += len(jpeg)
+
+                if self.clip is not None and timestamp >= self.clip[1]:
+                    self._finish_clip()
+
+        with self.lock:
+            if self.clip is not None:
+                self._finish_clip()
+        self.clips.put(None)
+
+    def _finish_clip(self):
+        wall_time, _, frames = self.clip
+        self.clip = None
+        self.clip_bytes = 0
+        try:
+            self.clips.put_nowait((wall_time, frames))
+            self.pending_bytes += sum(len(jpeg) for _, jpeg in frames)
+        except queue.Full:
+            self.clips_dropped += 1
+
+    def _write_loop(self):
+        while True:
+            item = self.clips.get()
+            if item is None:
+                break
+            wall_time, frames = item
+            try:
+                path = self._write(wall_time, frames)
+                self.clips_written += 1
+                self.console.info(f"Saved event clip {path}")
+            except Exception as e:
+                self.console.warning(f"Clip recording failed: {e}")
+            with self.lock:
+                self.pending_bytes -= sum(len(jpeg) for _, jpeg in frames)
+
+    def _write(self, wall_time, frames):
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.datetime.fromtimestamp(wall_time).strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(self.output_dir, f"{self.label}_{stamp}.mp4")
+
+        # Frames arrive at the processing rate; play the clip back in real time
+        span = frames[-1][0] - frames[0][0]
+        fps = (len(frames) - 1) / span if len(frames) > 1 and span > 0 else 1.0
+        first = cv2.imdecode(frames[0][1], cv2.IMREAD_COLOR)
+        height, width = first.shape[:2]
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+        if not writer.isOpened():
+            raise IOError(f"cannot open {path}")
+        try:
+            frame = first
+            for i in range(len(frames)):
+                if i:
+                    frame = cv2.imdecode(frames[i][1], cv2.IMREAD_COLOR)
+                if frame.shape[:2] != (height, width):
+                    frame = cv2.resize(frame, (width, height))
+                writer.write(frame)
+        finally:
+            writer.release()
+        return path
+
+    def get_stats(self):
+        with self.lock:
+            # Upper bound: the pre-event part of a clip is shared with the ring
+            memory = self.ring_bytes + self.clip_bytes + self.pending_bytes
+            buffered = len(self.ring)
+        return {
+            "memory_kb": memory / 1024,
+            "buffered_frames": buffered,
+            "encode_ms": self.encode_ms.mean,
+            "inbox": self.inbox.qsize(),
+            "writer_queue": self.clips.qsize(),
+            "frames_dropped": self.frames_dropped,
+            "clips_written": self.clips_written,
+            "clips_dropped": self.clips_dropped,
+        }
+
+    def stop(self, timeout=10.0):
+        """Finishes the clip in progress and waits for pending clips to be written."""
+        self.inbox.put(None)
+        self.encoder.join(timeout)
+        self.writer.join(timeout)
@@ -0,0 +1,110 @@
+import cv2
+import numpy as np
+
+
+class DetectionCache:
+    """
+    Reuses the detections of the last inferred frame for a frame that looks
+    the same. Only meant for frames on which the motion gate saw no motion
+    (its hold and keep-alive frames); a moving scene is always inferred.
+
+    Each frame is reduced to a small grey fingerprint (zero-mean, so slow
+    exposure drift does not count as change). A lookup hits when the mean
+    absolute difference to the last inferred frame is within `tolerance`
+    grey levels over the whole frame and within each region on its own:
+    the `regions` given (normalised xyxy, e.g. the camera's zones) and,
+    from the cached detections, every person box, its head (top quarter)
+    and every helmet box. A small change such as a helmet coming off is
+    thus not diluted by a static background.
+
+    The cached result serves at most `refresh_after` frames before a fresh
+    inference is forced.
+    """
+    def __init__(self, size=128, tolerance=3.0, refresh_after=30, regions=()):
+        self.size = size
+        self.tolerance = tolerance
+        self.refresh_after = refresh_after
+        self.regions = [tuple(region) for region in regions]
+
+        self.entry = None  # [fingerprint, detections, region masks, frames served]
+        self.grid = None
+
+        # Metrics
+        self.lookups = 0
+        self.hits = 0
+        self.forced_refreshes = 0
+
+    def fingerprint(self, frame):
+        height, width = frame.shape[:2]
+        scale = self.size / max(height, width)
+        grid = (max(1, round(width * scale)), max(1, round(height * scale)))
+        if grid != self.grid:
+            # New resolution: the stored fingerprint is no longer comparable
+            self.entry = None
+            self.grid = grid
+
+        gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        small = cv2.resize(gray, grid, interpolation=cv2.INTER_AREA).astype(np.float32)
+        return small - small.mean()
+
+    def _region_masks(self, regions):
+        width, height = self.grid
+        masks = []
+        for x1, y1, x2, y2 in regions:
+            mask = np.zeros((height, width), dtype=bool)
+            mask[int(y1 * height):max(int(np.ceil(y2 * height)), int(y1 * height) + 1),
+                 int(x1 * width):max(int(np.ceil(x2 * width)), int(x1 * width) + 1)] = True
+            masks.append(mask)
+        return masks
+
+    def _detection_regions(self, detections, width, height):
+        """Normalised person, head and helmet boxes of a frame's detections."""
+        persons = np.asarray(detections.persons, dtype=np.float32).reshape(-1, 4)
+        heads = persons.copy()
+        heads[:, 3] = persons[:, 1] + (persons[:, 3] - persons[:, 1]) / 4
+        helmets = np.asarray(detections.helmets, dtype=np.float32).reshape(-1, 4)
+        boxes = np.concatenate([persons, heads, helmets]) / (width, height, width, height)
+        return np.clip(boxes, 0, 1).tolist()
+
+    def lookup(self, frame):
+        """The last inferred frame's detections if this frame matches it, else None."""
+        self.lookups += 1
+        if self.entry is None:
+            return None
+
+        fp = self.fingerprint(frame)
+        if self.entry is None:
+            return None
+        diff = np.abs(self.entry[0] - fp)
+        error = diff.mean()
+        for mask in self.entry[2]:
+            error = max(error, diff[mask].mean())
+        if error > self.tolerance:
+            return None
+
+        if self.entry[3] >= self.refresh_after:
+            self.entry = None
+            self.forced_refreshes += 1
+            return None
+
+        self.entry[3] += 1
+        self.hits += 1
+        return self.entry[1]
+
+    def store(self, frame, detections):
+        """Remembers the detections of a freshly inferred frame (cache hits are ignored)."""
+        if self.entry is not None and self.entry[1] is detections:
+            return
+        fp = self.fingerprint(frame)
+        height, width = frame.shape[:2]
+        masks = self._region_masks(self.regions + self._detection_regions(detections, width, height))
+        self.entry = [fp, detections, masks, 0]
+
+    def get_stats(self):
+        return {
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+            "inferences_saved": self.hits,
+            "forced_refreshes": self.forced_refreshes,
+        }
@@ -2,241 +2,402 @@
 import cv2
 import numpy as np
 import time
-from ultralytics import YOLO
+from collections import deque, namedtuple
 
 from src.config.settings import Config
+from src.core.alert_state import AlertState
+from src.core.detector import Detector, EMPTY_DETECTIONS
+from src.core.matching import match_helmets
+from src.core.motion import MotionGate
+from src.core.overlay import TextCache, ZoneOverlay
+from src.core.recorder import ClipRecorder
+from src.core.scene_cache import DetectionCache
+from src.core.tiling import TilingPolicy
+from src.core.tracker import Tracker
+from src.core.zones import ZoneMap, feet_points, zones_for
 from src.utils.logger import ActivityLogger
+from src.services.alerts import AlertAggregator
 from src.services.telegram import TelegramService
 
+# Structured per-frame output of SurveillanceSystem.analyze(). Boxes are
+# (N, 4) int32 xyxy in `frame` coordinates; ids are track ids (empty lists
+# when tracking is off). `frame` and `full_frame` are the untouched source
+# images: nothing is drawn until render()/render_evidence() is called.
+AnalysisResult = namedtuple("AnalysisResult", [
+    "frame", "full_frame", "scale", "safe", "violations", "zone_violations",
+    "safe_ids", "violation_ids", "zone_violation_ids", "zone_names", "status"])
+
 class SurveillanceSystem:
-    def __init__(self):
-        self.logger = ActivityLogger(Config.LOG_FILE)
-        self.logger.info("Initializing Surveillance System...")
+    """
+    Per-camera safety analysis (zones, PPE matching, alert state).
+    Models live in a Detector, which may be shared between cameras.
+    Analysis never touches pixels; annotation is a separate render step
+    run only for consumers that need it (display, alert evidence).
+    """
+    def __init__(self, camera_id="cam0", detector=None, logger=None, alerter=None, alerts=True,
+                 label=None):
+        # camera_id selects the camera's zones; label (None = none) tags logs and alerts
+        self.camera_id = camera_id
+        self.label = label
+        self.logger = logger or ActivityLogger(Config.LOG_FILE)
+        self.logger.info(f"Initializing Surveillance System{self._label()}...")
 
         # Initialize Models
-        self._load_models()
+        self.detector = detector or Detector(self.logger)
         
-        # Services
-        self.telegram = TelegramService(Config.TELEGRAM_TOKEN, Config.TELEGRAM_CHAT_ID)
+        # Services (disabled for offline/batch analysis); the aggregator may
+        # be shared so alerts from several cameras are grouped
+        self.alerter = None
+        if alerts:
+            self.alerter = alerter or AlertAggregator(
+                TelegramService(Config.TELEGRAM_TOKEN, Config.TELEGRAM_CHAT_ID),
+                window=Config.ALERT_WINDOW, cooldown=Config.ALERT_KEY_COOLDOWN)
+
+        # Event clips: compressed pre-event buffer, written around each alert off-thread
+        self.recorder = None
+        if alerts and Config.CLIP_RECORDING:
+            self.recorder = ClipRecorder(
+                Config.CLIP_DIR, label=camera_id, pre_seconds=Config.CLIP_PRE_SECONDS,
+                post_seconds=Config.CLIP_POST_SECONDS, max_size=Config.CLIP_MAX_SIZE,
+                quality=Config.CLIP_QUALITY, cooldown=Config.ALERT_KEY_COOLDOWN)
         
+        # Motion gating: skip both detectors while the scene is static
+        self.motion_gate = None
+        if Config.MOTION_GATING:
+            self.motion_gate = MotionGate(
+                size=Config.MOTION_FRAME_SIZE, min_area=Config.MOTION_MIN_AREA,
+                hold_frames=Config.MOTION_HOLD_FRAMES, keepalive_frames=Config.MOTION_KEEPALIVE_FRAMES,
+                history=Config.MOTION_HISTORY, var_threshold=Config.MOTION_VAR_THRESHOLD)
+
+        # Tracking: detect every DETECT_INTERVAL frames, predict in between
+        self.tracker = None
+        if Config.TRACKING:
+            self.tracker = Tracker(iou_threshold=Config.TRACK_IOU_THRESHOLD,
+                                   max_misses=Config.TRACK_MAX_MISSES,
+                                   decay=Config.TRACK_CONFIDENCE_DECAY,
+                                   min_confidence=Config.TRACK_MIN_CONFIDENCE)
+        self.tracks = []
+        self.zone_track_ids = []
+        # Adjusted at runtime by the adaptive resolution controller
+        self.detect_interval = Config.DETECT_INTERVAL
+
+        # Restricted zones (label raster, rebuilt only on resolution change)
+        self.zones = ZoneMap(zones_for(camera_id))
+        # Rendering caches (zone overlays per resolution, status labels)
+        self.zone_overlay = ZoneOverlay(self.zones)
+        self.text_cache = TextCache()
+
+        # Static-scene cache: reuse detections while the frame looks unchanged
+        self.scene_cache = None
+        if Config.SCENE_CACHE:
+            regions = self._zone_boxes() if Config.SCENE_CACHE_PER_ZONE else ()
+            self.scene_cache = DetectionCache(size=Config.SCENE_CACHE_FINGERPRINT_SIZE,
+                                              tolerance=Config.SCENE_CACHE_TOLERANCE,
+                                              refresh_after=Config.SCENE_CACHE_REFRESH_FRAMES,
+                                              regions=regions)
+
+        # Tiled inference: extra full-resolution tiles over zones/recent motion
+        self.tiling = None
+        if Config.TILED_INFERENCE:
+            self.tiling = TilingPolicy(tile_size=Config.TILE_SIZE, overlap=Config.TILE_OVERLAP,
+                                       max_tiles=Config.TILE_MAX_PER_FRAME,
+                                       use_zones=Config.TILE_ZONES, use_motion=Config.TILE_MOTION)
+
         # State
         self.frame_count = 0
-        self.violation_counter = 0
+        self.event_time = None
+        self.last_detections = EMPTY_DETECTIONS
+        self.frames_since_detect = self.detect_interval  # The first frame is detected
+        self.frames_tracked = 0
+        # Motion gate decision per should_detect() call, consumed in order by
+        # analyze(); unbounded, as offline batches plan a whole batch first
+        self.gate_decisions = deque()
+        # Debounce/hold/cooldown per track and zone, on frame timestamps
+        self.alert_state = AlertState(debounce=Config.ALERT_DEBOUNCE, hold=Config.ALERT_HOLD,
+                                      cooldown=Config.ALERT_COOLDOWN)
         self.last_routine_scan = 0
 
-    def _load_models(self):
-        try:
-            self.model_person = YOLO(Config.MODEL_PERSON)
-            self.logger.info(f"Loaded {Config.MODEL_PERSON}")
-        except Exception as e:
-            self.logger.error(f"Failed to load person model: {e}")
-            raise e
-
-        try:
-            self.model_appe = YOLO(Config.MODEL_PPE)
-            self.ppe_active = True
-            self.logger.info(f"Loaded {Config.MODEL_PPE}")
-        except Exception:
-            self.logger.warning("PPE Model not found. Running in limited mode.")
-            self.ppe_active = False
+    def _label(self):
+        return f" [{self.label}]" if self.label is not None else ""
 
     def process_frame(self, frame):
         if frame is None:
             return frame
 
+        detections = None
+        if self.should_detect(frame):
+            detections = self.cached_detections(frame)
+            if detections is None:
+                detections = self.detector.detect_batch([frame], [self.plan_tiles(frame)])[0]
+        return self.analyze(frame, detections)
+
+    def should_detect(self, frame):
+        """
+        Whether the detectors must run on this frame (motion gate, then the
+        tracker's detect interval). Must be called once per frame, in order.
+        The gate's keep-alive frames, and its hold frames while no track is
+        live, are always detected: the tracker has nothing to carry there.
+        """
+        gated = self.motion_gate is not None and not self.motion_gate.should_detect(frame)
+        self.gate_decisions.append(gated)
+        if gated:
+            return False
+        if self.tracker is None:
+            return True
+
+        self.frames_since_detect += 1
+        idle = self.motion_gate is not None and not self.motion_gate.moving
+        if idle and (self.motion_gate.keepalive or not self.tracker.active()):
+            self.frames_since_detect = 0
+            return True
+        if self.frames_since_detect >= self.detect_interval or self.tracker.needs_refresh():
+            self.frames_since_detect = 0
+            return True
+        self.frames_tracked += 1
+        return False
+
+    def cached_detections(self, frame):
+        """
+        Detections of the last inferred frame when this one looks the same,
+        or None when the frame must be inferred. Call after should_detect().
+        Only frames on which the motion gate saw no motion are served.
+        """
+        if self.scene_cache is None or self.motion_gate is None or self.motion_gate.moving:
+            return None
+        return self.scene_cache.lookup(frame)
+
+    def _zone_boxes(self):
+        """Normalised bounding box of every zone."""
+        return [np.concatenate([zone.polygon.min(axis=0), zone.polygon.max(axis=0)])
+                for zone in self.zones.zones]
+
+    def plan_tiles(self, full_frame, scale=1.0):
+        """
+        TilePlan for a frame about to be detected (None when tiling is off or
+        nothing is worth tiling). Call after should_detect(), which updates
+        the motion regions it uses.
+        """
+        if self.tiling is None:
+            return None
+        motion_boxes = self.motion_gate.recent_regions() if self.motion_gate is not None else ()
+        return self.tiling.plan(full_frame, scale, self._zone_boxes(), motion_boxes)
+
+    def get_stats(self):
+        stats = {}
+        if self.motion_gate is not None:
+            stats["motion"] = self.motion_gate.get_stats()
+        if self.tracker is not None:
+            stats["tracking"] = {"frames_tracked": self.frames_tracked, "tracks": len(self.tracks)}
+        if self.tiling is not None:
+            stats["tiling"] = self.tiling.get_stats()
+        if self.scene_cache is not None:
+            stats["scene_cache"] = self.scene_cache.get_stats()
+        if self.recorder is not None:
+            stats["recording"] = self.recorder.get_stats()
+        return stats
+
+    def close(self):
+        """Finishes any clip in progress."""
+        if self.recorder is not None:
+            self.recorder.stop()
+
+    def analyze(self, frame, detections, full_frame=None, scale=1.0, event_time=None, timestamp=None):
+        """
+        Runs zone/PPE analysis for one frame given its detector output and
+        returns an AnalysisResult (see render() for the annotated image).
+        When `detections` is None (frame skipped by should_detect) tracked
+        boxes are propagated instead, or the previous frame's detections are
+        reused when tracking is off.
+        All geometry is in `frame` (inference) coordinates; `full_frame` is the
+        full-resolution original, `scale` times larger, used only for evidence.
+        `event_time` overrides the wall-clock timestamp of logged events
+        (e.g. the media position when analysing recorded footage).
+        `timestamp` is the frame time in seconds (capture time, media
+        position; default now) that alert debounce and hold are measured on.
+        """
+        if frame is None:
+            return frame
+
         self.frame_count += 1
-        height, width = frame.shape[:2]
-        
-        # Define Restricted Zone (Right 25%)
-        zone_x = int(width * 0.75)
-        roi_poly = np.array([
-            [zone_x, 0], [width, 0], 
-            [width, height], [zone_x, height]
-        ], np.int32)
-
-        # Draw Zone
-        self._draw_zone(frame, roi_poly)
-
-        # 1. Detect Persons
-        persons, p_confs = self._detect_persons(frame, height)
-        
-        # 2. Detect Helmets
-        helmets, h_confs = self._detect_helmets(frame)
+        self.event_time = event_time
+        timestamp = time.monotonic() if timestamp is None else timestamp
+
+        # Restricted Zones (rasterised for this resolution)
+        self.zones.update(frame.shape)
+
+        if self.recorder is not None:
+            self.recorder.add(frame)
 
-        # 3. Analyze Safety & Violations
-        matches, violations, safe_persons = self._match_ppe(persons, helmets)
+        # 1-2. Detected Persons & Helmets (skipped frame: reuse the last result)
+        fresh = detections is not None
+        if not fresh:
+            detections = self.last_detections
+        elif self.scene_cache is not None:
+            self.scene_cache.store(frame, detections)
+        self.last_detections = detections
+        persons, p_confs, helmets, h_confs = detections
+
+        gated = self.gate_decisions.popleft() if self.gate_decisions else False
+
+        # 3. Analyze Safety & Violations (per track when tracking)
+        if self.tracker is None:
+            matches, violations, safe_persons = self._match_ppe(persons, helmets)
+            ids = (None, None)
+        else:
+            safe_persons, violations, ids = self._track(fresh, gated, persons, p_confs, helmets)
         
         # 4. Check Zone Violations
-        zone_violations = self._check_zone_access(matches + violations, roi_poly)
+        zone_violations, self.zone_track_ids, zone_ids = self._check_zone_access(violations, ids[1])
+        zone_names = [self.zones.name(z) for z in sorted(set(zone_ids.tolist()))]
 
-        # Visualization
-        self._draw_detections(frame, safe_persons, violations, zone_violations)
-        
-        # Alert Logic
-        status_text = self._handle_alerts(frame, len(violations), len(zone_violations))
-        
-        # Render Status
-        self._draw_status(frame, status_text)
+        result = AnalysisResult(frame, full_frame, scale, safe_persons, violations, zone_violations,
+                                ids[0] or [], ids[1] or [], self.zone_track_ids, zone_names, None)
+
+        # Alert Logic (evidence is rendered at full resolution only when sent)
+        evidence = lambda status: self.render_evidence(result._replace(status=status))
+        keys = self._violation_keys(violations, ids[1], zone_ids)
+        status_text = self._handle_alerts(evidence, keys, timestamp)
         
         # Debug Logs (Model Accuracy)
         if self.frame_count % 30 == 0:
             self._log_debug_stats(p_confs, h_confs)
 
+        return result._replace(status=status_text)
+
+    def render(self, result):
+        """Annotated copy of the analysed (inference-size) frame."""
+        # Camera frames are shared read-only views; annotations go onto a private canvas
+        frame = result.frame.copy()
+        self._draw(frame, result.safe, result.violations, result.zone_violations, result)
         return frame
 
-    def _draw_zone(self, frame, poly):
-        overlay = frame.copy()
-        cv2.fillPoly(overlay, [poly], (0, 0, 255))
-        cv2.addWeighted(overlay, 0.3, frame, 0.7, 0, frame)
-        cv2.polylines(frame, [poly], True, (0, 0, 255), 2)
-        cv2.putText(frame, "RESTRICTED AREA", (poly[0][0] + 10, 30), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
-
-    def _detect_persons(self, frame, img_height):
-        # Run YOLO inference
-        results = self.model_person(frame, classes=[0], stream=True, 
-                                  conf=Config.CONF_PERSON, verbose=False)
-        
-        boxes = []
-        confs = []
-        for r in results:
-            for box in r.boxes:
-                coords = list(map(int, box.xyxy[0]))
-                conf = float(box.conf[0])
-                
-                # Filter small detections (e.g. erratic artifacts)
-                h = coords[3] - coords[1]
-                if h > img_height * 0.2: # Min 20% height
-                    boxes.append(coords)
-                    confs.append(conf)
-        
-        return boxes, confs
+    def render_evidence(self, result):
+        """Annotated copy of the full-resolution frame, geometry scaled up from inference size."""
+        if result.full_frame is None or result.scale == 1.0:
+            return self.render(result)
 
-    def _detect_helmets(self, frame):
-        boxes = []
-        confs = []
-        
-        if not self.ppe_active:
-            # Fallback: Color based (Simple Yellow)
-            # Keeping it simple for this implementation refactor
-            return boxes, confs
-
-        results = self.model_appe(frame, stream=True, conf=Config.CONF_HELMET, verbose=False)
-        for r in results:
-            for box in r.boxes:
-                cls_name = self.model_appe.names[int(box.cls[0])]
-                if "hat" in cls_name.lower() or "helmet" in cls_name.lower():
-                    boxes.append(list(map(int, box.xyxy[0])))
-                    confs.append(float(box.conf[0]))
-        
-        return boxes, confs
+        evidence = result.full_frame.copy()
+        safe, violations, zone_violations = (
+            (boxes * result.scale).astype(np.int32)
+            for boxes in (result.safe, result.violations, result.zone_violations))
+        self._draw(evidence, safe, violations, zone_violations, result)
+        return evidence
+
+    def _draw(self, frame, safe, violations, zone_violations, result):
+        self.zone_overlay.draw(frame)
+        self._draw_detections(frame, safe, violations, zone_violations,
+                              (result.safe_ids, result.violation_ids))
+        self._draw_status(frame, result.status)
+
+    def _track(self, fresh, gated, persons, p_confs, helmets):
+        """
+        Advances the tracker and splits tracks into safe/violating boxes.
+        PPE is matched on detection frames and carried by the track between them.
+        Frames the motion gate skipped hold the tracks still instead of predicting.
+        Returns: safe boxes, violation boxes, (safe track ids, violation track ids)
+        """
+        if fresh:
+            matches, _, _ = self._match_ppe(persons, helmets)
+            has_helmet = np.zeros(len(persons), dtype=bool)
+            has_helmet[matches[:, 0]] = True
+            self.tracks = self.tracker.update(persons, p_confs, has_helmet)
+        elif gated:
+            self.tracks = self.tracker.hold()
+        else:
+            self.tracks = self.tracker.predict()
+
+        safe = [t for t in self.tracks if t.has_helmet]
+        unsafe = [t for t in self.tracks if not t.has_helmet]
+        as_boxes = lambda tracks: np.array([t.box for t in tracks], dtype=np.int32).reshape(-1, 4)
+        return (as_boxes(safe), as_boxes(unsafe),
+                ([t.id for t in safe], [t.id for t in unsafe]))
 
     def _match_ppe(self, persons, helmets):
-        # Greedy matching based on head position
-        # Returns: matches (indices), violations (indices), safe_persons
-        
-        safe = []
-        violations = []
-        
-        used_helmets = set()
-        
-        for p in persons:
-            px1, py1, px2, py2 = p
-            p_head_y = py1
-            p_center_x = (px1 + px2) // 2
-            
-            has_helmet = False
-            
-            # Find best helmet match
-            best_h = -1
-            min_dist = float('inf')
-            
-            for i, h in enumerate(helmets):
-                if i in used_helmets:
-                    continue
-                    
-                hx1, hy1, hx2, hy2 = h
-                h_center_x = (hx1 + hx2) // 2
-                h_center_y = (hy1 + hy2) // 2
-                
-                # Logic: Helmet must be near top of person box
-                if (px1 < h_center_x < px2) and (py1 - 50 < h_center_y < py1 + (py2-py1)//3):
-                     dist = abs(p_center_x - h_center_x) + abs(p_head_y - h_center_y)
-                     if dist < min_dist:
-                         min_dist = dist
-                         best_h = i
-            
-            if best_h != -1:
-                person_width = px2 - px1
-                if min_dist < person_width: # Reasonable proximity
-                    used_helmets.add(best_h)
-                    has_helmet = True
-            
-            if has_helmet:
-                safe.append(p)
-            else:
-                violations.append(p)
-                
-        return [], violations, safe
-
-    def _check_zone_access(self, persons, zone_poly):
-        violators = []
-        for p in persons:
-            x1, y1, x2, y2 = p
-            feet_point = (int((x1 + x2) / 2), y2)
-            if cv2.pointPolygonTest(zone_poly, feet_point, False) >= 0:
-                violators.append(p)
-        return violators
-
-    def _draw_detections(self, frame, safe, violations, zone_violations):
-        for p in safe:
-            x1, y1, x2, y2 = p
+        # Optimal assignment based on head position (see match_helmets)
+        # Returns: matches (person index, helmet index), violations, safe_persons
+        persons = np.asarray(persons).reshape(-1, 4)
+        matches = match_helmets(persons, helmets)
+
+        has_helmet = np.zeros(len(persons), dtype=bool)
+        has_helmet[matches[:, 0]] = True
+        return matches, persons[~has_helmet], persons[has_helmet]
+
+    def _check_zone_access(self, persons, ids=None):
+        # One raster lookup of every person's feet point, however many zones
+        # Returns: violator boxes, their track ids (when tracking), their zone ids
+        zone_ids = self.zones.lookup(feet_points(persons))
+        inside = zone_ids > 0
+        violator_ids = [i for i, hit in zip(ids, inside) if hit] if ids else []
+        return persons[inside], violator_ids, zone_ids[inside]
+
+    def _draw_detections(self, frame, safe, violations, zone_violations, ids=(None, None)):
+        safe_ids, violation_ids = ids
+        for i, p in enumerate(safe):
+            x1, y1, x2, y2 = map(int, p)
+            label = f"SAFE #{safe_ids[i]}" if safe_ids else "SAFE"
             cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
-            cv2.putText(frame, "SAFE", (x1, y1-10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+            cv2.putText(frame, label, (x1, y1-10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
 
-        for p in violations:
-            x1, y1, x2, y2 = p
+        for i, p in enumerate(violations):
+            x1, y1, x2, y2 = map(int, p)
+            label = f"NO HELMET #{violation_ids[i]}" if violation_ids else "NO HELMET"
             cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 0, 255), 2)
-            cv2.putText(frame, "NO HELMET", (x1, y1-10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
+            cv2.putText(frame, label, (x1, y1-10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
 
         for p in zone_violations:
-             x1, y1, x2, y2 = p
+             x1, y1, x2, y2 = map(int, p)
              cv2.circle(frame, (int((x1+x2)/2), y2), 5, (0, 0, 255), -1)
 
-    def _handle_alerts(self, frame, violation_count, zone_count):
-        status = "Status: Nominal"
-        
-        is_violation = (violation_count > 0 or zone_count > 0)
-        
-        if is_violation:
-            self.violation_counter += 1
-        else:
-            self.violation_counter = max(0, self.violation_counter - 1)
-            
-        if self.violation_counter > Config.ALERT_COOLDOWN: # Using cooldown as a frame buffer roughly
-            msg = []
-            if zone_count > 0: msg.append("Restricted Zone Access")
-            if violation_count > 0: msg.append("PPE Violation")
-            
-            alert_msg = " + ".join(msg)
-            status = f"ALERT: {alert_msg}"
-            
-            # Trigger External Services
-            self.telegram.send_snapshot(frame, f"🚨 {alert_msg}")
-            
-            if self.frame_count % 60 == 0:
-                self.logger.log_event(violation_count + zone_count, "VIOLATION", alert_msg)
+    def _violation_keys(self, violations, violation_ids, zone_ids):
+        """Alert state keys: (type, zone name, track id); track id is None without tracking."""
+        keys = set()
+        if len(violations):
+            keys.update(("ppe", None, track_id) for track_id in (violation_ids or [None]))
+        track_ids = self.zone_track_ids or [None] * len(zone_ids)
+        keys.update(("zone", self.zones.name(z), track_id) for z, track_id in zip(zone_ids.tolist(), track_ids))
+        return keys
+
+    @staticmethod
+    def _describe(keys):
+        msg = []
+        zone_names = sorted({zone for kind, zone, _ in keys if kind == "zone" and zone})
+        if any(kind == "zone" for kind, _, _ in keys):
+            msg.append("Restricted Zone Access" + (f" ({', '.join(zone_names)})" if zone_names else ""))
+        if any(kind == "ppe" for kind, _, _ in keys):
+            msg.append("PPE Violation")
+        return " + ".join(msg)
+
+    def _handle_alerts(self, evidence, keys, timestamp):
+        fired = self.alert_state.update(timestamp, keys)
+        active = self.alert_state.active()
+        if not active:
+            return "Status: Nominal"
+
+        alert_msg = self._describe(active)
+        status = f"ALERT: {alert_msg}"
+        if not fired:
+            return status
 
+        # New incidents only: one per type and zone, however many tracks
+        incidents = sorted({(kind, zone) for kind, zone, _ in fired}, key=str)
+        if self.alerter:
+            self.alerter.report(self.label,
+                                [(kind, zone, self._describe([(kind, zone, None)])) for kind, zone in incidents],
+                                lambda: evidence(status))
+        if self.recorder:
+            self.recorder.trigger()
+        self.logger.log_event(len(fired), "VIOLATION", f"{self._describe(fired)}{self._label()}",
+                              timestamp=self.event_time)
         return status
 
     def _draw_status(self, frame, text):
         color = (0, 0, 255) if "ALERT" in text else (0, 255, 0)
-        cv2.putText(frame, text, (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, color, 2)
+        self.text_cache.draw(frame, text, (20, 40), 1, color, 2)
 
     def _log_debug_stats(self, p_confs, h_confs):
-        if p_confs:
-            avg = sum(p_confs)/len(p_confs)
-            print(f"[DEBUG] Person Accuracy: {avg:.2%}")
-        if h_confs:
-            avg = sum(h_confs)/len(h_confs)
-            print(f"[DEBUG] Helmet Accuracy: {avg:.2%}")
+        if len(p_confs):
+            avg = float(np.mean(p_confs))
+            print(f"[DEBUG]{self._label()} Person Accuracy: {avg:.2%}")
+        if len(h_confs):
+            avg = float(np.mean(h_confs))
+            print(f"[DEBUG]{self._label()} Helmet Accuracy: {avg:.2%}")
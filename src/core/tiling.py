@@ -0,0 +1,161 @@
+from collections import namedtuple
+
+import numpy as np
+
+from src.core.tracker import iou_matrix
+
+# Tiles to run for one frame: (K, 4) int xyxy crops of the full-resolution
+# `image`, which is `scale` times larger than the inference frame
+TilePlan = namedtuple("TilePlan", ["image", "scale", "tiles"])
+
+
+def tile_grid(width, height, size, overlap):
+    """
+    Overlapping size x size tiles covering a width x height frame, as (K, 4)
+    xyxy. Tiles are shifted inward at the right/bottom edges so every tile
+    has the same size (a frame smaller than `size` is a single tile).
+    """
+    def starts(length):
+        if length <= size:
+            return [0]
+        step = max(1, int(size * (1 - overlap)))
+        points = list(range(0, length - size, step))
+        return points + [length - size]
+
+    tw, th = min(size, width), min(size, height)
+    return np.array([[x, y, x + tw, y + th] for y in starts(height) for x in starts(width)],
+                    dtype=np.int32).reshape(-1, 4)
+
+
+def intersecting(tiles, regions):
+    """Mask of the tiles that overlap any of the (M, 4) region boxes."""
+    regions = np.asarray(regions, dtype=np.float32).reshape(-1, 4)
+    if not len(regions):
+        return np.zeros(len(tiles), dtype=bool)
+    overlap_x = (tiles[:, None, 0] < regions[None, :, 2]) & (regions[None, :, 0] < tiles[:, None, 2])
+    overlap_y = (tiles[:, None, 1] < regions[None, :, 3]) & (regions[None, :, 1] < tiles[:, None, 3])
+    return (overlap_x & overlap_y).any(axis=1)
+
+
+def cut_by_tile(boxes, tile, width, height, margin=2):
+    """
+    Mask of the (N, 4) boxes, in full-image coordinates, found in `tile` of
+    a width x height image that touch one of its inner borders (a tile edge
+    that is not the image edge): people the tile may have cut in part.
+    """
+    x1, y1, x2, y2 = tile
+    b = np.asarray(boxes).reshape(-1, 4)
+    return (((x1 > 0) & (b[:, 0] <= x1 + margin)) | ((y1 > 0) & (b[:, 1] <= y1 + margin))
+            | ((x2 < width) & (b[:, 2] >= x2 - margin)) | ((y2 < height) & (b[:, 3] >= y2 - margin)))
+
+
+def merge_boxes(boxes, confs, iou_threshold=0.5, contain_threshold=0.8, cut=None):
+    """
+    Cross-tile NMS. A box flagged in `cut` (found in a tile and touching
+    its inner border, see cut_by_tile) that lies mostly (contain_threshold
+    of its area) inside a larger box is a person cut by the tile border and
+    is dropped in favour of the larger box. Other boxes are never dropped
+    for containment, so a distant worker standing in front of or behind a
+    near one is kept. The rest goes through greedy IoU suppression, highest
+    confidence first.
+    Returns the kept (boxes, confs) in input order.
+    """
+    if len(boxes) < 2:
+        return boxes, confs
+
+    alive = np.ones(len(boxes), dtype=bool)
+    if cut is not None and contain_threshold is not None and cut.any():
+        b = boxes.astype(np.float32)
+        area = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+        inter_w = np.clip(np.minimum(b[:, None, 2], b[None, :, 2]) - np.maximum(b[:, None, 0], b[None, :, 0]), 0, None)
+        inter_h = np.clip(np.minimum(b[:, None, 3], b[None, :, 3]) - np.maximum(b[:, None, 1], b[None, :, 1]), 0, None)
+        # contained[i, j]: box i lies inside the larger box j
+        contained = ((inter_w * inter_h >= contain_threshold * np.maximum(area[:, None], 1e-9))
+                     & (area[:, None] < area[None, :]))
+        alive = ~(contained.any(axis=1) & cut)
+
+    iou = iou_matrix(boxes, boxes)
+    keep = []
+    for i in np.argsort(-confs):
+        if alive[i] and (not keep or iou[i, keep].max() < iou_threshold):
+            keep.append(i)
+    keep.sort()
+    return boxes[keep], confs[keep]
+
+
+class TilingPolicy:
+    """
+    Decides which tiles of a high-resolution frame get a detection pass on
+    top of the single downscaled pass. Only tiles overlapping a region that
+    matters are candidates: the camera's restricted zones and the areas of
+    recent motion. At most `max_tiles` run per frame; when more qualify,
+    motion tiles come first and the rest are visited round-robin over the
+    following detection frames, so the cost per frame stays bounded.
+    """
+    def __init__(self, tile_size=640, overlap=0.2, max_tiles=4, use_zones=True, use_motion=True):
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.max_tiles = max_tiles
+        self.use_zones = use_zones
+        self.use_motion = use_motion
+
+        self.grids = {}
+        self.cursor = 0
+
+        # Metrics
+        self.frames_planned = 0
+        self.frames_tiled = 0
+        self.tiles_run = 0
+
+    def grid(self, width, height):
+        key = (width, height)
+        if key not in self.grids:
+            self.grids[key] = tile_grid(width, height, self.tile_size, self.overlap)
+        return self.grids[key]
+
+    def plan(self, image, scale, zone_boxes=(), motion_boxes=()):
+        """
+        TilePlan for one full-resolution image, or None when no tile is
+        worth running. Region boxes are normalised (fractions of the frame).
+        """
+        self.frames_planned += 1
+        height, width = image.shape[:2]
+        # A frame the single pass already sees at (near) native resolution
+        if max(height, width) <= self.tile_size * 1.25:
+            return None
+
+        tiles = self.grid(width, height)
+        size = np.array([width, height, width, height], dtype=np.float32)
+        motion = intersecting(tiles, np.asarray(motion_boxes, dtype=np.float32).reshape(-1, 4) * size) \
+            if self.use_motion else np.zeros(len(tiles), dtype=bool)
+        zones = intersecting(tiles, np.asarray(zone_boxes, dtype=np.float32).reshape(-1, 4) * size) \
+            if self.use_zones else np.zeros(len(tiles), dtype=bool)
+
+        first = np.flatnonzero(motion)
+        rest = np.flatnonzero(zones & ~motion)
+        if len(first) + len(rest) == 0:
+            return None
+
+        if len(first) >= self.max_tiles:
+            selected = self._rotate(first, self.max_tiles)
+        else:
+            selected = np.concatenate([first, self._rotate(rest, self.max_tiles - len(first))])
+
+        self.frames_tiled += 1
+        self.tiles_run += len(selected)
+        return TilePlan(image, scale, tiles[np.sort(selected)])
+
+    def _rotate(self, candidates, count):
+        """`count` candidates, continuing where the previous frame stopped."""
+        if len(candidates) <= count:
+            return candidates
+        start = self.cursor % len(candidates)
+        self.cursor = start + count
+        return np.roll(candidates, -start)[:count]
+
+    def get_stats(self):
+        return {
+            "frames_tiled": self.frames_tiled,
+            "tiles_run": self.tiles_run,
+            "tiles_per_frame": self.tiles_run / self.frames_planned if self.frames_planned else 0.0,
+        }
@@ -0,0 +1,143 @@
+import numpy as np
+
+
+def iou_matrix(a, b):
+    """Pairwise IoU between (N, 4) and (M, 4) xyxy boxes."""
+    a = np.asarray(a, dtype=np.float32).reshape(-1, 4)
+    b = np.asarray(b, dtype=np.float32).reshape(-1, 4)
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+
+
+class Track:
+    """
+    One tracked person: a constant-velocity Kalman filter over the box
+    centre and size, plus the attributes carried between detections.
+    State: [cx, cy, w, h, vx, vy, vw, vh].
+    """
+    # Shared model matrices
+    F = np.eye(8)
+    F[:4, 4:] = np.eye(4)
+    H = np.eye(4, 8)
+
+    def __init__(self, track_id, box, score, has_helmet):
+        x1, y1, x2, y2 = box
+        self.id = track_id
+        self.x = np.array([(x1 + x2) / 2, (y1 + y2) / 2, x2 - x1, y2 - y1, 0, 0, 0, 0], dtype=np.float64)
+        self.P = np.diag([10.0, 10.0, 10.0, 10.0, 1000.0, 1000.0, 1000.0, 1000.0])
+        self.score = score
+        self.confidence = score
+        self.has_helmet = has_helmet
+        self.hits = 1
+        self.misses = 0
+
+    def _noise(self):
+        # Process/measurement noise scale with the box size (SORT/DeepSORT style)
+        size = max(self.x[3], 1.0)
+        q = np.square([size / 20] * 4 + [size / 160] * 4)
+        r = np.square([size / 20] * 4)
+        return np.diag(q), np.diag(r)
+
+    def predict(self):
+        if self.x[2] + self.x[6] <= 0 or self.x[3] + self.x[7] <= 0:
+            self.x[6:] = 0
+        Q, _ = self._noise()
+        self.x = self.F @ self.x
+        self.P = self.F @ self.P @ self.F.T + Q
+
+    def correct(self, box, score, has_helmet):
+        x1, y1, x2, y2 = box
+        z = np.array([(x1 + x2) / 2, (y1 + y2) / 2, x2 - x1, y2 - y1])
+        _, R = self._noise()
+        S = self.H @ self.P @ self.H.T + R
+        K = self.P @ self.H.T @ np.linalg.inv(S)
+        self.x = self.x + K @ (z - self.H @ self.x)
+        self.P = (np.eye(8) - K @ self.H) @ self.P
+
+        self.score = score
+        self.confidence = score
+        self.has_helmet = has_helmet
+        self.hits += 1
+        self.misses = 0
+
+    @property
+    def box(self):
+        cx, cy, w, h = self.x[:4]
+        return [int(cx - w / 2), int(cy - h / 2), int(cx + w / 2), int(cy + h / 2)]
+
+
+class Tracker:
+    """
+    Lightweight multi-object tracker (IoU association + Kalman prediction)
+    that lets the detectors run only every few frames.
+
+    update() is called on detection frames and predict() on the frames in
+    between. Each track's confidence starts at its detection score, decays
+    on every predicted frame and drops sharply when a detection round
+    misses it; needs_refresh() tells the caller to detect early once any
+    track has become too uncertain.
+    """
+    def __init__(self, iou_threshold=0.3, max_misses=3, decay=0.95, min_confidence=0.3):
+        self.iou_threshold = iou_threshold
+        self.max_misses = max_misses
+        self.decay = decay
+        self.min_confidence = min_confidence
+        self.tracks = []
+        self.next_id = 1
+
+    def active(self):
+        """Tracks confirmed by the most recent detection round."""
+        return [t for t in self.tracks if t.misses == 0]
+
+    def predict(self):
+        for track in self.tracks:
+            track.predict()
+            track.confidence *= self.decay
+        return self.active()
+
+    def hold(self):
+        """Keeps tracks in place for a frame without motion (and stops their drift)."""
+        for track in self.tracks:
+            track.x[4:] = 0
+        return self.active()
+
+    def update(self, boxes, scores, helmet_flags):
+        for track in self.tracks:
+            track.predict()
+
+        matched_tracks, matched_dets = set(), set()
+        if self.tracks and len(boxes):
+            iou = iou_matrix([t.box for t in self.tracks], boxes)
+            # Greedy association, best overlaps first
+            for flat in np.argsort(-iou, axis=None):
+                t, d = np.unravel_index(flat, iou.shape)
+                if iou[t, d] < self.iou_threshold:
+                    break
+                if t in matched_tracks or d in matched_dets:
+                    continue
+                self.tracks[t].correct(boxes[d], scores[d], helmet_flags[d])
+                matched_tracks.add(t)
+                matched_dets.add(d)
+
+        for t, track in enumerate(self.tracks):
+            if t not in matched_tracks:
+                track.misses += 1
+                track.confidence *= 0.5
+        self.tracks = [t for t in self.tracks if t.misses <= self.max_misses]
+
+        for d in range(len(boxes)):
+            if d not in matched_dets:
+                self.tracks.append(Track(self.next_id, boxes[d], scores[d], helmet_flags[d]))
+                self.next_id += 1
+
+        return self.active()
+
+    def needs_refresh(self):
+        return any(t.confidence < self.min_confidence for t in self.active())
@@ -0,0 +1,83 @@
+import logging
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+from src.config.settings import Config
+
+# polygon: (K, 2) float array of (x, y) in fractions of the frame size
+Zone = namedtuple("Zone", ["name", "polygon", "color"])
+
+DEFAULT_COLOR = (0, 0, 255)
+
+
+def zones_for(camera_id, definitions=None):
+    """
+    Zone list for one camera from a Config.ZONES style mapping:
+    {camera_id: [zone, ...], "default": [zone, ...]}, each zone a dict with
+    "name", "polygon" (normalised [[x, y], ...]) and optional BGR "color".
+    A camera without an entry of its own gets the "default" zones.
+    """
+    definitions = Config.ZONES if definitions is None else definitions
+    entries = definitions.get(camera_id, definitions.get("default"))
+    if entries is None:
+        logging.getLogger("IndustrialMonitor").warning(
+            f"No zones defined for camera {camera_id} (and no \"default\"): zone checks are off")
+        entries = []
+    return [Zone(entry.get("name", f"Zone {i + 1}"),
+                 np.asarray(entry["polygon"], dtype=np.float64).reshape(-1, 2),
+                 tuple(entry.get("color", DEFAULT_COLOR)))
+            for i, entry in enumerate(entries)]
+
+
+class ZoneMap:
+    """
+    Zones of one camera rasterised into a label map: pixel value i is zone
+    i (1-based, in definition order; later zones win where they overlap),
+    0 is outside every zone. The raster is built once per resolution, so
+    looking up any number of points costs one fancy-indexing operation
+    regardless of how many zones the camera has.
+    """
+    def __init__(self, zones):
+        self.zones = list(zones)
+        self.version = 0 # Bumped on every set_zones(); lets renderers drop their caches
+        self.labels = None
+        self.shape = None
+        self.polygons = []
+
+    def set_zones(self, zones):
+        self.zones = list(zones)
+        self.version += 1
+        self.shape = None # Rebuilt on the next update()
+
+    def update(self, shape):
+        """Rebuilds the raster when the frame resolution or the zones changed."""
+        shape = tuple(shape[:2])
+        if shape == self.shape:
+            return
+        height, width = shape
+        dtype = np.uint8 if len(self.zones) < 256 else np.uint16
+        self.labels = np.zeros(shape, dtype=dtype)
+        self.polygons = [np.round(zone.polygon * (width, height)).astype(np.int32)
+                         for zone in self.zones]
+        for label, poly in enumerate(self.polygons, start=1):
+            cv2.fillPoly(self.labels, [poly], label)
+        self.shape = shape
+
+    def lookup(self, points):
+        """Zone id (0 = none) for each (x, y) pixel point, as an (N,) array."""
+        points = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+        height, width = self.shape
+        xs = np.clip(points[:, 0], 0, width - 1)
+        ys = np.clip(points[:, 1], 0, height - 1)
+        return self.labels[ys, xs]
+
+    def name(self, zone_id):
+        return self.zones[zone_id - 1].name
+
+
+def feet_points(boxes):
+    """Bottom-centre point of each (N, 4) xyxy box."""
+    boxes = np.asarray(boxes).reshape(-1, 4)
+    return np.stack([(boxes[:, 0] + boxes[:, 2]) // 2, boxes[:, 3]], axis=1)
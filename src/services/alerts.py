@@ -0,0 +1,112 @@
+import threading
+import time
+
+
+class AlertAggregator:
+    """
+    Coalesces alerts from every camera into grouped messages.
+
+    Each incident is keyed by (camera, violation type, zone). The first
+    report of a key opens a `window`-second collection window (if none is
+    open); repeats of a pending key are deduplicated, and a key that was
+    reported less than `cooldown` seconds ago is suppressed. When the window
+    closes, all pending incidents go out together: one captioned snapshot
+    per camera (rendered once, on that camera's first incident), sent as a
+    single photo or as albums of up to `max_album` photos.
+    """
+    def __init__(self, telegram, window=3.0, cooldown=15.0, max_album=10):
+        self.telegram = telegram
+        self.window = window
+        self.cooldown = cooldown
+        self.max_album = max(2, min(10, max_album))  # Bot API albums hold 2-10 items
+
+        self.lock = threading.Lock()
+        self.pending = {}  # (camera, kind, zone) -> text, in arrival order
+        self.snapshots = {}  # camera -> evidence frame
+        self.last_reported = {}  # key -> monotonic time
+        self.timer = None
+
+        # Metrics
+        self.reported = 0
+        self.deduplicated = 0
+        self.suppressed = 0
+        self.incidents_sent = 0
+        self.messages = 0
+
+    def report(self, camera_id, incidents, evidence):
+        """
+        Offers (kind, zone, text) incidents seen by one camera. `evidence`
+        is called (at most once per camera and window) for the snapshot.
+        Returns the number of incidents accepted.
+        """
+        if not self.telegram.enabled:
+            return 0
+
+        now = time.monotonic()
+        with self.lock:
+            accepted = 0
+            for kind, zone, text in incidents:
+                key = (camera_id, kind, zone)
+                self.reported += 1
+                if key in self.pending:
+                    self.deduplicated += 1
+                elif now - self.last_reported.get(key, -self.cooldown) < self.cooldown:
+                    self.suppressed += 1
+                else:
+                    self.pending[key] = text
+                    self.last_reported[key] = now
+                    accepted += 1
+
+            if accepted:
+                if camera_id not in self.snapshots:
+                    self.snapshots[camera_id] = evidence()
+                if self.timer is None:
+                    self.timer = threading.Timer(self.window, self.flush)
+                    self.timer.daemon = True
+                    self.timer.start()
+        return accepted
+
+    def flush(self):
+        """Sends every pending incident now."""
+        with self.lock:
+            pending, snapshots = self.pending, self.snapshots
+            self.pending, self.snapshots = {}, {}
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+        if not pending:
+            return
+
+        # One captioned photo per camera, cameras in order of first incident
+        texts = {}
+        for (camera_id, _, _), text in pending.items():
+            texts.setdefault(camera_id, []).append(text)
+        items = [(snapshots[camera_id], self._caption(camera_id, lines))
+                 for camera_id, lines in texts.items()]
+
+        for i in range(0, len(items), self.max_album):
+            chunk = items[i:i + self.max_album]
+            if len(chunk) == 1:
+                self.telegram.send_snapshot(*chunk[0])
+            else:
+                self.telegram.send_album(chunk)
+            self.messages += 1
+        self.incidents_sent += len(pending)
+
+    @staticmethod
+    def _caption(camera_id, lines):
+        label = f" [{camera_id}]" if camera_id is not None else ""
+        return f"🚨 {' + '.join(lines)}{label}"
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                "reported": self.reported,
+                "deduplicated": self.deduplicated,
+                "suppressed": self.suppressed,
+                "incidents_sent": self.incidents_sent,
+                "messages": self.messages,
+            }
+
+    def close(self):
+        self.flush()
@@ -0,0 +1,165 @@
+import logging
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class Dispatcher:
+    """
+    Long-lived outbound queue for Bot API calls.
+
+    Messages go into a bounded queue (the oldest is dropped when it is
+    full) and are delivered by a small pool of worker threads sharing one
+    keep-alive requests.Session. Failed calls are retried with exponential
+    backoff; a 429 response pauses every worker for the `retry_after` the
+    API asks for. Other 4xx responses are not retried.
+
+    `files` may be a callable returning the files dict, so expensive
+    payloads (e.g. JPEG encoding) are produced on a worker, not the caller.
+    """
+    def __init__(self, base_url, workers=2, max_queue=32, max_retries=4, backoff=1.0,
+                 max_backoff=30.0, timeout=10.0, session=None):
+        self.base_url = base_url
+        self.max_queue = max_queue
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.console = logging.getLogger("IndustrialMonitor")
+
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.queue = deque()
+        self.cond = threading.Condition()
+        self.closed = False
+        self.busy = 0
+        self.paused_until = 0.0  # Rate limited by the API until then (monotonic)
+
+        # Metrics
+        self.queued = 0
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.retries = 0
+
+        self.threads = [threading.Thread(target=self._worker, name=f"dispatch-{i}", daemon=True)
+                        for i in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, method, data, files=None):
+        """Queues one API call; never blocks. Returns False once closed."""
+        with self.cond:
+            if self.closed:
+                return False
+            if len(self.queue) >= self.max_queue:
+                self.queue.popleft()
+                self.dropped += 1
+            self.queue.append((method, data, files))
+            self.queued += 1
+            self.cond.notify()
+        return True
+
+    def _worker(self):
+        while True:
+            with self.cond:
+                while not self.queue and not self.closed:
+                    self.cond.wait()
+                if not self.queue:
+                    return
+                job = self.queue.popleft()
+                self.busy += 1
+
+            try:
+                delivered = self._deliver(*job)
+            except Exception as e:
+                # Payload preparation failed: nothing to retry
+                self.console.warning(f"Telegram {job[0]} failed: {e}")
+                delivered = False
+
+            with self.cond:
+                self.busy -= 1
+                if delivered:
+                    self.sent += 1
+                else:
+                    self.failed += 1
+                self.cond.notify_all()
+
+    def _deliver(self, method, data, files):
+        if callable(files):
+            files = files()
+        url = f"{self.base_url}/{method}"
+        error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                with self.cond:
+                    self.retries += 1
+            self._wait_for_rate_limit()
+            last = attempt == self.max_retries
+            try:
+                response = self.session.post(url, data=data, files=files, timeout=self.timeout)
+            except requests.RequestException as e:
+                error = e
+                if not last:
+                    time.sleep(self._backoff(attempt))
+                continue
+
+            if response.ok:
+                return True
+            error = f"HTTP {response.status_code}: {response.text[:200]}"
+            if response.status_code == 429:
+                self._pause(self._retry_after(response, attempt))
+            elif response.status_code >= 500:
+                if not last:
+                    time.sleep(self._backoff(attempt))
+            else:
+                break # Bad request, wrong token, ...: retrying will not help
+
+        self.console.warning(f"Telegram {method} failed: {error}")
+        return False
+
+    def _backoff(self, attempt):
+        return min(self.max_backoff, self.backoff * 2 ** attempt)
+
+    def _retry_after(self, response, attempt):
+        try:
+            return float(response.json()["parameters"]["retry_after"])
+        except (ValueError, KeyError, TypeError):
+            return self._backoff(attempt)
+
+    def _pause(self, seconds):
+        with self.cond:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def _wait_for_rate_limit(self):
+        delay = self.paused_until - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def get_stats(self):
+        with self.cond:
+            return {
+                "queued": self.queued,
+                "sent": self.sent,
+                "failed": self.failed,
+                "dropped": self.dropped,
+                "retries": self.retries,
+                "pending": len(self.queue) + self.busy,
+            }
+
+    def close(self, timeout=5.0):
+        """Stops accepting messages and waits up to `timeout` for the queue to drain."""
+        deadline = time.monotonic() + timeout
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+            while (self.queue or self.busy) and time.monotonic() < deadline:
+                self.cond.wait(deadline - time.monotonic())
+            self.queue.clear()
+        self.session.close()
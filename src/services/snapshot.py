@@ -0,0 +1,80 @@
+import threading
+import time
+
+import cv2
+
+from src.core.camera import fit_to_size
+from src.utils.metrics import RollingStat
+
+
+class SnapshotEncoder:
+    """
+    JPEG encoding of alert snapshots within a pixel and byte budget.
+
+    Frames are downscaled so their longest side is at most `max_size`
+    (into a buffer reused per worker thread), then encoded at the quality
+    that last fit under `max_bytes`. An oversized result is re-encoded at
+    lower quality down to `min_quality`, and past that at a smaller size;
+    a result well under budget lets the next snapshot try a higher quality.
+
+    encode() is meant to run on the dispatcher workers, so the processing
+    loop only hands over the frame.
+    """
+    def __init__(self, max_size=1920, max_bytes=300_000, quality=90, min_quality=40):
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.max_quality = quality
+        self.min_quality = min(min_quality, quality)
+        self.quality = quality  # Last quality that fit the budget
+        self.local = threading.local()
+
+        # Metrics
+        self.encode_ms = RollingStat()
+        self.payload_bytes = RollingStat()
+        self.encodes = 0
+        self.over_budget = 0
+
+    def encode(self, frame):
+        """JPEG bytes (a uint8 array) of the frame, within the budget when possible."""
+        start = time.perf_counter()
+        image = fit_to_size(frame, self.max_size, getattr(self.local, "resized", None))
+        if image is not frame:
+            self.local.resized = image
+
+        quality = self.quality
+        while True:
+            ok, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+            if not ok:
+                raise ValueError("JPEG encoding failed")
+            size = len(buffer)
+            self.encodes += 1
+            if not self.max_bytes or size <= self.max_bytes:
+                break
+            if quality > self.min_quality:
+                quality = max(self.min_quality, quality - (10 if size > 1.5 * self.max_bytes else 5))
+            elif min(image.shape[:2]) > 64:
+                # Quality floor reached: trade pixels instead (size ~ area)
+                shrink = max(0.5, min(0.9, (self.max_bytes / size) ** 0.5))
+                image = cv2.resize(image, None, fx=shrink, fy=shrink, interpolation=cv2.INTER_AREA)
+            else:
+                self.over_budget += 1
+                break
+
+        # Sticky quality; climb back slowly once snapshots come out small
+        if self.max_bytes and size < 0.6 * self.max_bytes and quality < self.max_quality:
+            quality = min(self.max_quality, quality + 5)
+        self.quality = quality
+
+        self.encode_ms.add((time.perf_counter() - start) * 1000)
+        self.payload_bytes.add(size)
+        return buffer
+
+    def get_stats(self):
+        return {
+            "snapshots": self.payload_bytes.total,
+            "encode_ms": self.encode_ms.mean,
+            "payload_kb": self.payload_bytes.mean / 1024,
+            "quality": self.quality,
+            "encodes": self.encodes,
+            "over_budget": self.over_budget,
+        }
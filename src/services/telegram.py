@@ -1,48 +1,72 @@
-import requests
-import threading
-import time
-import cv2
+import json
+
+from src.config.settings import Config
+from src.services.dispatcher import Dispatcher
+from src.services.snapshot import SnapshotEncoder
 
 class TelegramService:
-    def __init__(self, token, chat_id):
+    def __init__(self, token, chat_id, api_url=None):
         self.token = token
         self.chat_id = chat_id
-        self.base_url = f"https://api.telegram.org/bot{self.token}"
-        self.last_alert_time = 0
-        self.cooldown = 15
+        self.base_url = f"{api_url or Config.TELEGRAM_API_URL}/bot{self.token}"
+        self.encoder = SnapshotEncoder(max_size=Config.SNAPSHOT_MAX_SIZE,
+                                       max_bytes=Config.SNAPSHOT_MAX_BYTES,
+                                       quality=Config.SNAPSHOT_QUALITY,
+                                       min_quality=Config.SNAPSHOT_MIN_QUALITY)
+        self.dispatcher = None
+        if self.token and self.chat_id:
+            self.dispatcher = Dispatcher(self.base_url, workers=Config.TELEGRAM_WORKERS,
+                                         max_queue=Config.TELEGRAM_QUEUE_SIZE,
+                                         max_retries=Config.TELEGRAM_MAX_RETRIES,
+                                         backoff=Config.TELEGRAM_BACKOFF,
+                                         timeout=Config.TELEGRAM_TIMEOUT)
 
     def send_alert(self, message):
         """Sends a text message notification."""
-        threading.Thread(target=self._send_text_task, args=(message,), daemon=True).start()
+        if self.dispatcher:
+            self.dispatcher.submit("sendMessage", {"chat_id": self.chat_id, "text": message})
+
+    @property
+    def enabled(self):
+        return self.dispatcher is not None
 
     def send_snapshot(self, frame, caption=None):
-        """Sends a visual snapshot of the event."""
-        if time.time() - self.last_alert_time < self.cooldown:
+        """
+        Sends a visual snapshot of the event. The frame is handed over, not
+        copied: the caller must not modify it afterwards.
+        """
+        if not self.dispatcher:
+            return
+        data = {'chat_id': self.chat_id}
+        if caption:
+            data['caption'] = caption
+        # Encoded on a dispatcher worker, not on the processing loop
+        self.dispatcher.submit("sendPhoto", data, files=lambda: self._photo(frame))
+
+    def send_album(self, items):
+        """Sends 2-10 (frame, caption) snapshots as one album (frames are handed over)."""
+        if not self.dispatcher:
             return
+        media = [{"type": "photo", "media": f"attach://photo{i}", "caption": caption}
+                 for i, (_, caption) in enumerate(items)]
+        data = {'chat_id': self.chat_id, 'media': json.dumps(media)}
+        frames = [frame for frame, _ in items]
+        self.dispatcher.submit("sendMediaGroup", data, files=lambda: self._album(frames))
+
+    def _album(self, frames):
+        return {f'photo{i}': (f'alert{i}.jpg', self.encoder.encode(frame), 'image/jpeg')
+                for i, frame in enumerate(frames)}
+
+    def _photo(self, frame):
+        # The encoded array is uploaded as is (no bytes copy)
+        return {'photo': ('alert.jpg', self.encoder.encode(frame), 'image/jpeg')}
+
+    def get_stats(self):
+        if not self.dispatcher:
+            return {}
+        return {**self.dispatcher.get_stats(), "snapshot": self.encoder.get_stats()}
 
-        self.last_alert_time = time.time()
-        threading.Thread(target=self._send_photo_task, args=(frame.copy(), caption), daemon=True).start()
-
-    def _send_text_task(self, message):
-        try:
-            url = f"{self.base_url}/sendMessage"
-            payload = {"chat_id": self.chat_id, "text": message}
-            requests.post(url, json=payload, timeout=5)
-        except Exception as e:
-            pass # Fail silently for network issues to avoid clutter
-
-    def _send_photo_task(self, frame, caption):
-        try:
-            is_success, buffer = cv2.imencode(".jpg", frame)
-            if not is_success:
-                return
-            
-            url = f"{self.base_url}/sendPhoto"
-            files = {'photo': ('alert.jpg', buffer.tobytes(), 'image/jpeg')}
-            data = {'chat_id': self.chat_id}
-            if caption:
-                data['caption'] = caption
-            
-            requests.post(url, data=data, files=files, timeout=10)
-        except Exception:
-            pass
+    def close(self, timeout=5.0):
+        """Flushes pending messages (up to `timeout` seconds)."""
+        if self.dispatcher:
+            self.dispatcher.close(timeout)
@@ -30,8 +30,10 @@ class ActivityLogger:
                 writer = csv.writer(f)
                 writer.writerow(["Timestamp", "Event Type", "Details", "Count"])
 
-    def log_event(self, count, event_type, details=""):
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    def log_event(self, count, event_type, details="", timestamp=None):
+        # Offline runs pass the original media time instead of the wall clock
+        if timestamp is None:
+            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
         # Write to CSV
         try:
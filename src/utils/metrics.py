@@ -0,0 +1,57 @@
+import threading
+import time
+from collections import deque
+
+
+class RollingStat:
+    """Windowed mean/max over a stream of samples (latencies, sizes, ...)."""
+    def __init__(self, window=120):
+        self.samples = deque(maxlen=window)
+        self.total = 0
+        self.lock = threading.Lock()
+
+    def add(self, value):
+        with self.lock:
+            self.samples.append(value)
+            self.total += 1
+
+    @property
+    def last(self):
+        with self.lock:
+            return self.samples[-1] if self.samples else 0.0
+
+    @property
+    def mean(self):
+        with self.lock:
+            return sum(self.samples) / len(self.samples) if self.samples else 0.0
+
+    @property
+    def max(self):
+        with self.lock:
+            return max(self.samples) if self.samples else 0.0
+
+    def summary(self):
+        return {"last": self.last, "mean": self.mean, "max": self.max, "count": self.total}
+
+
+class RateMeter:
+    """Events per second measured over a sliding time window."""
+    def __init__(self, window=2.0):
+        self.window = window
+        self.stamps = deque()
+        self.lock = threading.Lock()
+
+    def tick(self, now=None):
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            self.stamps.append(now)
+            while self.stamps and now - self.stamps[0] > self.window:
+                self.stamps.popleft()
+
+    @property
+    def rate(self):
+        with self.lock:
+            if len(self.stamps) < 2:
+                return 0.0
+            span = self.stamps[-1] - self.stamps[0]
+            return (len(self.stamps) - 1) / span if span > 0 else 0.0
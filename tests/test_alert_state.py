@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from src.config.settings import Config
+from src.core.alert_state import AlertState
+from src.core.offline import EventCollector
+
+KEY = ("ppe", None, 1)
+
+
+def timeline(fps, seconds=12.0):
+    """Frame timestamps; the violation is seen from 1 s to 4 s and again from 6 s to 8 s."""
+    for i in range(int(seconds * fps)):
+        t = i / fps
+        yield t, 1.0 <= t < 4.0 or 6.0 <= t < 8.0
+
+
+def run_state(fps):
+    state = AlertState(debounce=2.0, hold=1.0, cooldown=30.0)
+    fired, active = [], []
+    for t, seen in timeline(fps):
+        if state.update(t, [KEY] if seen else []):
+            fired.append(t)
+        active.append((t, bool(state.active())))
+    return fired, active
+
+
+def cleared_at(active):
+    """Time the first activation ended."""
+    was = False
+    for t, now in active:
+        if was and not now:
+            return t
+        was = now
+    return None
+
+
+@pytest.mark.parametrize("fps", [5, 30])
+def test_alert_fires_after_debounce_and_respects_cooldown(fps):
+    fired, active = run_state(fps)
+
+    # Once, 2 s after the violation starts; the second episode is in cooldown
+    assert fired == [pytest.approx(3.0, abs=1 / fps)]
+    # Cleared `hold` seconds after the violation stops
+    assert cleared_at(active) == pytest.approx(5.0, abs=1 / fps)
+
+
+def test_timing_does_not_depend_on_the_frame_rate():
+    slow, slow_active = run_state(5)
+    fast, fast_active = run_state(30)
+
+    assert fast == pytest.approx(slow, abs=1 / 5)
+    assert cleared_at(fast_active) == pytest.approx(cleared_at(slow_active), abs=1 / 5)
+
+
+def analyze_timeline(monkeypatch, fps):
+    """VIOLATION events logged by SurveillanceSystem._handle_alerts, as frame times."""
+    detector_module = pytest.importorskip("src.core.detector")
+    from src.core.surveillance import SurveillanceSystem
+
+    monkeypatch.setattr(Config, "ALERT_DEBOUNCE", 2.0)
+    monkeypatch.setattr(Config, "ALERT_HOLD", 1.0)
+    monkeypatch.setattr(Config, "ALERT_COOLDOWN", 30.0)
+    collector = EventCollector()
+    system = SurveillanceSystem(detector=object(), logger=collector, alerts=False)
+
+    frame = np.zeros((360, 640, 3), dtype=np.uint8)
+    # No helmet, feet inside the default restricted area (right quarter)
+    person = detector_module.Detections(np.array([[520, 60, 600, 340]], dtype=np.int32),
+                                        np.array([0.9], dtype=np.float32),
+                                        *detector_module.empty_boxes())
+    for t, seen in timeline(fps):
+        system.analyze(frame, person if seen else detector_module.EMPTY_DETECTIONS,
+                       event_time=t, timestamp=t)
+    return [event[0] for event in collector.events if event[1] == "VIOLATION"]
+
+
+def test_surveillance_alerts_at_the_same_time_at_5_and_30_fps(monkeypatch):
+    slow = analyze_timeline(monkeypatch, 5)
+    fast = analyze_timeline(monkeypatch, 30)
+
+    assert slow == [pytest.approx(3.0, abs=1 / 5)]
+    assert fast == pytest.approx(slow, abs=1 / 5)
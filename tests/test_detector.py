@@ -0,0 +1,31 @@
+import logging
+
+import numpy as np
+import pytest
+
+from src.config.settings import Config
+
+detector_module = pytest.importorskip("src.core.detector")
+
+
+def test_head_crops_are_cut_from_the_full_resolution_frame(monkeypatch):
+    monkeypatch.setattr(Config, "PPE_HEAD_CROPS", True)
+    detector = detector_module.Detector(logging.getLogger("test"))
+    if not detector.head_crops:
+        pytest.skip("PPE model not available")
+
+    crops = []
+    preprocess = detector.crop_preprocessor
+    monkeypatch.setattr(detector, "crop_preprocessor", lambda images: (crops.extend(images), preprocess(images))[1])
+
+    frame = np.zeros((360, 640, 3), dtype=np.uint8)
+    full = np.zeros((1440, 2560, 3), dtype=np.uint8)
+    small_only = detector.detect_batch([frame])[0]
+    count = len(crops)
+    with_full = detector.detect_batch([frame], full_frames=[full])[0]
+
+    # Same head regions, four times the pixels
+    assert [c.shape[:2] for c in crops[count:]] == [(4 * h, 4 * w) for h, w in
+                                                     (c.shape[:2] for c in crops[:count])]
+    # Helmets are mapped back to inference coordinates
+    assert np.abs(with_full.helmets - small_only.helmets).max() <= 1
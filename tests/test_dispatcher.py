@@ -0,0 +1,123 @@
+import threading
+import time
+
+import pytest
+
+from benchmarks.bench_dispatcher import StubAPI
+from src.services.dispatcher import Dispatcher
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def start(**options):
+        server = StubAPI(**options)
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def dispatcher_for(server, **options):
+    return Dispatcher(f"{server.url}/botTEST", **options)
+
+
+def captions(server):
+    return [fields["caption"][0] for _, _, fields in server.requests]
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_full_queue_drops_the_oldest_message(stub):
+    server = stub(latency=0.3)
+    dispatcher = dispatcher_for(server, workers=1, max_queue=2)
+
+    dispatcher.submit("sendMessage", {"chat_id": 1, "caption": "0"})
+    # The worker is busy with message 0; 1 and 2 are pushed out by 3 and 4
+    wait_until(lambda: len(server.requests) == 1)
+    for i in range(1, 5):
+        dispatcher.submit("sendMessage", {"chat_id": 1, "caption": str(i)})
+    dispatcher.close(timeout=5)
+
+    assert captions(server) == ["0", "3", "4"]
+    stats = dispatcher.get_stats()
+    assert (stats["queued"], stats["sent"], stats["dropped"], stats["failed"]) == (5, 3, 2, 0)
+    assert stats["pending"] == 0
+
+
+def test_rate_limit_waits_for_retry_after(stub):
+    server = stub(retry_after=1, script=[429])
+    dispatcher = dispatcher_for(server, workers=1, backoff=0.01)
+
+    dispatcher.submit("sendMessage", {"chat_id": 1, "caption": "a"})
+    dispatcher.close(timeout=5)
+
+    first, second = (t for t, _, _ in server.requests)
+    assert second - first >= 1.0
+    stats = dispatcher.get_stats()
+    assert (stats["sent"], stats["retries"], stats["failed"]) == (1, 1, 0)
+
+
+def test_server_errors_are_retried_with_backoff(stub):
+    server = stub(script=[500, 502])
+    dispatcher = dispatcher_for(server, workers=1, backoff=0.2)
+
+    dispatcher.submit("sendMessage", {"chat_id": 1, "caption": "a"})
+    dispatcher.close(timeout=5)
+
+    times = [t for t, _, _ in server.requests]
+    gaps = [b - a for a, b in zip(times, times[1:])]
+    assert len(times) == 3
+    assert gaps[0] >= 0.2 and gaps[1] >= 0.4
+    stats = dispatcher.get_stats()
+    assert (stats["sent"], stats["retries"], stats["failed"]) == (1, 2, 0)
+
+
+def test_gives_up_without_sleeping_after_the_last_attempt(stub):
+    server = stub(script=[500, 500, 200])
+    dispatcher = dispatcher_for(server, workers=1, max_retries=1, backoff=0.5)
+
+    start = time.monotonic()
+    dispatcher.submit("sendMessage", {"chat_id": 1, "caption": "a"})
+    dispatcher.close(timeout=5)
+
+    assert time.monotonic() - start < 1.0
+    assert len(server.requests) == 2
+    stats = dispatcher.get_stats()
+    assert (stats["sent"], stats["retries"], stats["failed"]) == (0, 1, 1)
+
+
+def test_client_errors_are_not_retried(stub):
+    server = stub(script=[400])
+    dispatcher = dispatcher_for(server, workers=1, backoff=0.01)
+
+    dispatcher.submit("sendMessage", {"chat_id": 1, "caption": "a"})
+    dispatcher.close(timeout=5)
+
+    assert len(server.requests) == 1
+    stats = dispatcher.get_stats()
+    assert (stats["sent"], stats["retries"], stats["failed"]) == (0, 0, 1)
+
+
+def test_counters_over_many_messages(stub):
+    server = stub(retry_after=0.2, script=[500, 429, 200, 500])
+    dispatcher = dispatcher_for(server, workers=2, backoff=0.01)
+
+    for i in range(20):
+        dispatcher.submit("sendMessage", {"chat_id": 1, "caption": str(i)})
+    dispatcher.close(timeout=10)
+
+    assert sorted(set(captions(server)), key=int) == [str(i) for i in range(20)]
+    stats = dispatcher.get_stats()
+    assert (stats["queued"], stats["sent"], stats["failed"], stats["dropped"]) == (20, 20, 0, 0)
+    assert stats["retries"] == len(server.requests) - 20 == 3
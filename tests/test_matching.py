@@ -0,0 +1,63 @@
+import itertools
+
+import numpy as np
+
+from src.core import matching
+from src.core.matching import match_helmets
+
+
+def brute_force(persons, helmets):
+    """Most matched people, then least total distance, over every assignment."""
+    def eligible(p, h):
+        px1, py1, px2, py2 = p
+        cx, cy = (h[0] + h[2]) // 2, (h[1] + h[3]) // 2
+        dist = abs((px1 + px2) // 2 - cx) + abs(py1 - cy)
+        return px1 < cx < px2 and py1 - 50 < cy < py1 + (py2 - py1) // 3 and dist < px2 - px1, dist
+
+    best = (0, 0)
+    # Every person takes one helmet or none (None), no helmet twice
+    for choice in itertools.product([None, *range(len(helmets))], repeat=len(persons)):
+        taken = [j for j in choice if j is not None]
+        if len(taken) != len(set(taken)):
+            continue
+        pairs = [eligible(persons[i], helmets[j]) for i, j in enumerate(choice) if j is not None]
+        found = [dist for ok, dist in pairs if ok]
+        best = max(best, (len(found), -sum(found)))
+    return best
+
+
+def score(persons, helmets, matches):
+    dist = [abs((persons[i][0] + persons[i][2]) // 2 - (helmets[j][0] + helmets[j][2]) // 2)
+            + abs(persons[i][1] - (helmets[j][1] + helmets[j][3]) // 2) for i, j in matches]
+    return len(dist), -sum(dist)
+
+
+def random_scene(rng, n_persons, n_helmets):
+    xs = rng.integers(0, 400, n_persons)
+    ys = rng.integers(100, 200, n_persons)
+    persons = np.stack([xs, ys, xs + rng.integers(60, 140, n_persons),
+                        ys + rng.integers(300, 400, n_persons)], 1)
+    cx = rng.integers(0, 500, n_helmets)
+    cy = rng.integers(60, 260, n_helmets)
+    helmets = np.stack([cx - 20, cy - 15, cx + 20, cy + 15], 1)
+    return persons, helmets
+
+
+def test_adjacent_workers_both_get_a_helmet():
+    persons = np.array([[100, 100, 220, 500], [170, 100, 290, 500]])
+    helmets = np.array([[165, 80, 205, 120], [90, 80, 130, 120]])
+
+    assert match_helmets(persons, helmets).tolist() == [[0, 1], [1, 0]]
+
+
+def test_matches_are_optimal(monkeypatch):
+    rng = np.random.default_rng(0)
+    for solver in (matching._compiled_assignment, None):
+        monkeypatch.setattr(matching, "_compiled_assignment", solver)
+        for _ in range(200):
+            persons, helmets = random_scene(rng, rng.integers(0, 5), rng.integers(0, 5))
+            matches = match_helmets(persons, helmets)
+
+            assert len(set(matches[:, 0])) == len(set(matches[:, 1])) == len(matches)
+            assert score(persons.tolist(), helmets.tolist(), matches.tolist()) \
+                == brute_force(persons.tolist(), helmets.tolist())
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from src.config.settings import Config
+
+detector_module = pytest.importorskip("src.core.detector")
+from src.core.surveillance import SurveillanceSystem  # noqa: E402
+
+
+class CountingDetector:
+    """One person standing still; counts the frames it is run on."""
+    def __init__(self):
+        self.calls = 0
+
+    def detect_batch(self, frames, plans=None, full_frames=None):
+        self.calls += len(frames)
+        person = np.array([[100, 100, 200, 300]], dtype=np.int32)
+        return [detector_module.Detections(person, np.array([0.9], dtype=np.float32),
+                                           *detector_module.empty_boxes())
+                for _ in frames]
+
+
+@pytest.fixture
+def system(monkeypatch):
+    monkeypatch.setattr(Config, "MOTION_GATING", True)
+    monkeypatch.setattr(Config, "TRACKING", True)
+    monkeypatch.setattr(Config, "SCENE_CACHE", False)
+    monkeypatch.setattr(Config, "TILED_INFERENCE", False)
+    return SurveillanceSystem(detector=CountingDetector(), alerts=False)
+
+
+def test_static_scene_is_detected_on_every_keepalive_frame(system):
+    frame = np.full((360, 640, 3), 90, dtype=np.uint8)
+
+    detected = []
+    for i in range(120):
+        calls = system.detector.calls
+        system.process_frame(frame)
+        if system.detector.calls > calls:
+            detected.append(i)
+
+    keepalive = Config.MOTION_KEEPALIVE_FRAMES
+    assert detected == list(range(0, 120, keepalive))
+
+
+def test_gate_decisions_survive_a_whole_batch(system):
+    frame = np.full((360, 640, 3), 90, dtype=np.uint8)
+
+    plans = [system.should_detect(frame) for _ in range(16)]
+    assert len(system.gate_decisions) == 16
+    for detect in plans:
+        system.analyze(frame, system.detector.detect_batch([frame])[0] if detect else None)
+    assert not system.gate_decisions
@@ -0,0 +1,33 @@
+import numpy as np
+
+from src.core.tiling import cut_by_tile, merge_boxes
+
+
+def test_contained_boxes_of_the_single_pass_are_kept():
+    # A distant worker standing behind a near one
+    boxes = np.array([[100, 100, 300, 500], [150, 120, 200, 220]], dtype=np.int32)
+    confs = np.array([0.9, 0.8], dtype=np.float32)
+
+    kept, _ = merge_boxes(boxes, confs, cut=np.zeros(2, dtype=bool))
+
+    assert kept.tolist() == boxes.tolist()
+
+
+def test_person_cut_by_a_tile_border_is_dropped():
+    tile = np.array([0, 0, 640, 640])
+    # Full person from the downscaled pass, and its upper half from the tile
+    boxes = np.array([[500, 400, 600, 900], [502, 402, 598, 640]], dtype=np.int32)
+    confs = np.array([0.8, 0.9], dtype=np.float32)
+    cut = np.concatenate([[False], cut_by_tile(boxes[1:], tile, 3840, 2160)])
+
+    kept, kept_confs = merge_boxes(boxes, confs, cut=cut)
+
+    assert kept.tolist() == [[500, 400, 600, 900]]
+    assert kept_confs.tolist() == [np.float32(0.8)]
+
+
+def test_image_edges_are_not_tile_borders():
+    tile = np.array([0, 0, 640, 640])
+    boxes = np.array([[0, 0, 50, 100], [300, 300, 400, 500], [600, 300, 640, 500]])
+
+    assert cut_by_tile(boxes, tile, 3840, 2160).tolist() == [False, False, True]